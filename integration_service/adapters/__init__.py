@@ -1,18 +1,28 @@
 """Package for all adapters."""
 
 from .ai_image_service import AiImageService
+from .capture_watcher import (
+    CaptureWatcher,
+    close_capture_watcher,
+    get_capture_watcher,
+    wait_for_capture_files,
+)
 from .competition_format_adapter import CompetitionFormatAdapter
 from .config_adapter import ConfigAdapter
 from .contestants_adapter import ContestantsAdapter
 from .events_adapter import EventsAdapter
-from .exceptions import VideoStreamNotFoundError
+from .exceptions import BackendUnavailableError, VideoStreamNotFoundError
 from .google_cloud_storage_adapter import GoogleCloudStorageAdapter
 from .google_pub_sub_adapter import GooglePubSubAdapter
+from .http_client import close_session, get_session, set_token_manager
 from .photos_adapter import PhotosAdapter
 from .photos_file_adapter import PhotosFileAdapter
+from .poll_scheduler import PollScheduler
 from .raceclasses_adapter import RaceclassesAdapter
 from .raceplans_adapter import RaceplansAdapter
 from .start_adapter import StartAdapter
 from .status_adapter import StatusAdapter
+from .status_sink import StatusSink
 from .sync_service import SyncService
+from .token_manager import TokenManager
 from .user_adapter import UserAdapter
@@ -1,9 +1,34 @@
 """Module for image services."""
 
+import asyncio
+import functools
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from google.cloud import vision
 
+VISION_MAX_CONCURRENCY = int(os.getenv("VISION_MAX_CONCURRENCY", "8"))
+VISION_TIMEOUT = float(os.getenv("VISION_TIMEOUT", "30"))
+
+_vision_client: vision.ImageAnnotatorClient | None = None
+_vision_client_lock = threading.Lock()
+# blocking gRPC calls run here, off the event loop
+_vision_executor = ThreadPoolExecutor(
+    max_workers=VISION_MAX_CONCURRENCY, thread_name_prefix="vision"
+)
+_vision_semaphore = asyncio.Semaphore(VISION_MAX_CONCURRENCY)
+
+
+def get_vision_client() -> vision.ImageAnnotatorClient:
+    """Return long-lived Vision client, create it on first use."""
+    global _vision_client  # noqa: PLW0603
+    with _vision_client_lock:
+        if _vision_client is None:
+            _vision_client = vision.ImageAnnotatorClient()  # type: ignore[no-untyped-call]
+        return _vision_client
+
 
 class AiImageService:
     """Class representing image services."""
@@ -13,8 +38,7 @@ class AiImageService:
         logging.debug("Enter Google vision API")
         _tags = {}
 
-        # Instantiates a client
-        client = vision.ImageAnnotatorClient()
+        client = get_vision_client()
         image = vision.Image()
         image.source.image_uri = image_uri
 
@@ -61,8 +85,36 @@ class AiImageService:
 
         return _tags
 
-    def analyze_photo_g_langrenn_v2(
+    async def analyze_photo_g_langrenn_v2_async(
         self, image_uri: str, crop_uri: str, conf_limit: str
+    ) -> dict:
+        """Run analyze_photo_g_langrenn_v2 in the Vision thread pool.
+
+        At most VISION_MAX_CONCURRENCY requests are in flight, each limited
+        by VISION_TIMEOUT seconds, so the event loop is never blocked.
+        """
+        loop = asyncio.get_running_loop()
+        async with _vision_semaphore:
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(
+                        _vision_executor,
+                        functools.partial(
+                            self.analyze_photo_g_langrenn_v2,
+                            image_uri,
+                            crop_uri,
+                            conf_limit,
+                            timeout=VISION_TIMEOUT,
+                        ),
+                    ),
+                    timeout=VISION_TIMEOUT,
+                )
+            except TimeoutError as e:
+                err_msg = f"Vision API timeout after {VISION_TIMEOUT} seconds, image {image_uri}"
+                raise Exception(err_msg) from e
+
+    def analyze_photo_g_langrenn_v2(
+        self, image_uri: str, crop_uri: str, conf_limit: str, timeout: float | None = None
     ) -> dict:
         """Send infile to Vision API, return dict with langrenn info."""
         logging.info(f"Enter vision, image {image_uri}")
@@ -75,8 +127,7 @@ class AiImageService:
         }
 
         try:
-            # Instantiates a client
-            client = vision.ImageAnnotatorClient()  # type: ignore[no-untyped-call]
+            client = get_vision_client()
             # Loads the image into memory
             image = vision.Image()
             image.source.image_uri = image_uri
@@ -88,20 +139,28 @@ class AiImageService:
             logging.exception(err_msg)
             raise Exception(err_msg) from e
 
-        # Performs object detection on the image file
-        _tags["persons"] = self.detect_persons(client, image, conf_limit)
-
-        # Performs text detection on the image file
-        _tags["ai_numbers"], _tags["ai_text"] = self.detect_text(client, image, conf_limit)
-        _tags["ai_crop_numbers"], _tags["ai_crop_text"] = self.detect_text(client, image_crop, conf_limit)
+        # One request for both images: objects and text on full image, text on crop
+        text_feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+        object_feature = vision.Feature(type_=vision.Feature.Type.OBJECT_LOCALIZATION)
+        response = client.batch_annotate_images(  # type: ignore[no-untyped-call]
+            requests=[
+                vision.AnnotateImageRequest(image=image, features=[object_feature, text_feature]),
+                vision.AnnotateImageRequest(image=image_crop, features=[text_feature]),
+            ],
+            timeout=timeout,
+        )
+        image_response, crop_response = response.responses
+
+        _tags["persons"] = self.count_persons(image_response, conf_limit)
+        _tags["ai_numbers"], _tags["ai_text"] = self.extract_text(image_response, conf_limit)
+        _tags["ai_crop_numbers"], _tags["ai_crop_text"] = self.extract_text(crop_response, conf_limit)
         return _tags
 
 
-    def detect_persons(self, client: vision.ImageAnnotatorClient, image: vision.Image, conf_limit: str) -> int:
-        """Detect persons in the image."""
-        objects = client.object_localization(image=image).localized_object_annotations  # type: ignore[no-untyped-call]
+    def count_persons(self, response: vision.AnnotateImageResponse, conf_limit: str) -> int:
+        """Count persons in object localization response."""
         count_persons = 0
-        for object_ in objects:
+        for object_ in response.localized_object_annotations:
             logging.debug(
                 f"Found object: {object_.name} (confidence: {object_.score})"
             )
@@ -111,11 +170,10 @@ class AiImageService:
         return count_persons
 
 
-    def detect_text(self, client: vision.ImageAnnotatorClient, image: vision.Image, conf_limit: str) -> tuple:
-        """Detect text in the image."""
+    def extract_text(self, response: vision.AnnotateImageResponse, conf_limit: str) -> tuple:
+        """Extract numbers and words from text detection response."""
         _numbers = []
         _texts = []
-        response = client.document_text_detection(image=image)  # type: ignore[no-untyped-call]
         for page in response.full_text_annotation.pages:
             for block in page.blocks:
                 for paragraph in block.paragraphs:
@@ -0,0 +1,113 @@
+"""Module for on-disk cache of Vision AI results."""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+AI_CACHE_PATH = os.getenv(
+    "AI_CACHE_PATH", f"{Path.cwd()}/integration_service/files/ai_cache"
+)
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+class AiResultCache:
+    """Class representing a size bounded, least recently used cache of AI results.
+
+    Entries are content addressed by the GCS MD5 hash (or generation) of the
+    detection blob and the confidence limit used in the analysis.
+    """
+
+    def __init__(self, cache_path: str, max_bytes: int) -> None:
+        """Initialize cache, the index is loaded from disk on first use."""
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+
+    def make_key(self, detection: dict, conf_limit: str) -> str:
+        """Create cache key for detection, empty string if blob has no content id."""
+        content_id = detection.get("md5_hash") or detection.get("generation")
+        if not content_id:
+            return ""
+        return hashlib.sha256(f"{content_id}|{conf_limit}".encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Get cached result, None on miss."""
+        entries = self._load_index()
+        if key and key in entries:
+            cache_file = self.cache_path / f"{key}.json"
+            try:
+                result = json.loads(cache_file.read_text())
+                cache_file.touch()  # keep recency across restarts
+            except (OSError, json.JSONDecodeError):
+                logging.debug(f"AI cache entry {key} unreadable, dropped.")
+                self._remove(key)
+            else:
+                entries.move_to_end(key)
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        """Store result, evict least recently used entries above max size."""
+        if not key:
+            return
+        entries = self._load_index()
+        data = json.dumps(result)
+        try:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_path / f"{key}.tmp"
+            tmp_file.write_text(data)
+            tmp_file.replace(self.cache_path / f"{key}.json")
+        except OSError:
+            logging.exception(f"Error writing AI cache entry {key}")
+            return
+        self._total_bytes += len(data) - entries.get(key, 0)
+        entries[key] = len(data)
+        entries.move_to_end(key)
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            oldest = next(iter(entries))
+            self._remove(oldest)
+
+    def stats(self) -> dict:
+        """Get cache counters."""
+        entries = self._load_index()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": self._total_bytes,
+        }
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Load index of cached entries from disk, oldest first."""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+            if self.cache_path.exists():
+                files = sorted(
+                    self.cache_path.glob("*.json"), key=lambda f: f.stat().st_mtime
+                )
+                for file in files:
+                    size = file.stat().st_size
+                    self._entries[file.stem] = size
+                    self._total_bytes += size
+        return self._entries
+
+    def _remove(self, key: str) -> None:
+        """Remove entry from index and disk."""
+        entries = self._load_index()
+        self._total_bytes -= entries.pop(key, 0)
+        try:
+            (self.cache_path / f"{key}.json").unlink(missing_ok=True)
+        except OSError:
+            logging.exception(f"Error deleting AI cache entry {key}")
+
+
+ai_result_cache = AiResultCache(AI_CACHE_PATH, AI_CACHE_MAX_BYTES)
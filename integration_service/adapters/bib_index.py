@@ -0,0 +1,110 @@
+"""Module for in-memory bib lookup tables."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from .contestants_adapter import ContestantsAdapter
+from .race_index import invalidate_race_index
+from .start_adapter import StartAdapter
+
+BIB_INDEX_TTL = float(os.getenv("BIB_INDEX_TTL", "60"))
+BIB_INDEX_MISS_REFRESH = float(os.getenv("BIB_INDEX_MISS_REFRESH", "15"))
+
+
+class BibIndex:
+    """Class representing bib to start entries and bib to contestant tables for one event."""
+
+    def __init__(self) -> None:
+        """Initialize empty tables."""
+        self.start_entries: dict[int, list[dict]] = {}
+        self.contestants: dict[int, dict] = {}
+        self.signature = ""
+        self.loaded_at: float | None = None
+
+    def update_starts(self, startlists: list) -> bool:
+        """Rebuild bib to start entries table, return True if the start list changed."""
+        start_entries: dict[int, list[dict]] = {}
+        for startlist in startlists:
+            for start_entry in startlist.get("start_entries", []):
+                try:
+                    bib = int(start_entry["bib"])
+                except (KeyError, TypeError, ValueError):
+                    logging.debug(f"Start entry without valid bib - {start_entry}")
+                    continue
+                start_entries.setdefault(bib, []).append(start_entry)
+
+        signature = hashlib.sha256(
+            json.dumps(
+                sorted(
+                    (bib, str(entry.get("race_id", "")))
+                    for bib, entries in start_entries.items()
+                    for entry in entries
+                )
+            ).encode("utf-8")
+        ).hexdigest()
+        self.start_entries = start_entries
+        changed = signature != self.signature
+        self.signature = signature
+        return changed
+
+    def update_contestants(self, contestants: list) -> None:
+        """Rebuild bib to contestant table."""
+        by_bib = {}
+        for contestant in contestants:
+            try:
+                by_bib[int(contestant["bib"])] = contestant
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.contestants = by_bib
+
+    def is_stale(self, max_age: float) -> bool:
+        """Check if tables are older than max_age seconds."""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+
+_bib_indexes: dict[str, BibIndex] = {}
+_bib_index_locks: dict[str, asyncio.Lock] = {}
+
+
+async def get_bib_index(token: str, event_id: str, max_age: float = BIB_INDEX_TTL) -> BibIndex:
+    """Get bib index for event, refresh if older than max_age seconds.
+
+    Contestants are only reloaded when the start list has changed. Refresh
+    is single-flight per event - concurrent callers wait for the first one
+    and reuse its result.
+    """
+    bib_index = _bib_indexes.setdefault(event_id, BibIndex())
+    if not bib_index.is_stale(max_age):
+        return bib_index
+    async with _bib_index_locks.setdefault(event_id, asyncio.Lock()):
+        if bib_index.is_stale(max_age):
+            startlists = await StartAdapter().get_all_starts_by_event(token, event_id)
+            if bib_index.update_starts(startlists) or not bib_index.contestants:
+                contestants = await ContestantsAdapter().get_all_contestants(token, event_id)
+                bib_index.update_contestants(contestants)
+                # start list changed - heats and start times may have changed too
+                invalidate_race_index(event_id)
+                logging.debug(
+                    f"Bib index for event {event_id} rebuilt, {len(bib_index.start_entries)} bibs."
+                )
+            bib_index.loaded_at = time.monotonic()
+    return bib_index
+
+
+async def find_start_entries_by_bib(token: str, event_id: str, bib: int) -> list:
+    """Get start entries for bib, refresh tables (throttled) if bib is unknown."""
+    bib_index = await get_bib_index(token, event_id)
+    if bib not in bib_index.start_entries:
+        bib_index = await get_bib_index(token, event_id, BIB_INDEX_MISS_REFRESH)
+    return bib_index.start_entries.get(bib, [])
+
+
+def invalidate_bib_index(event_id: str = "") -> None:
+    """Force refresh of bib index for one event, or for all events, on next use."""
+    for key, bib_index in _bib_indexes.items():
+        if key == event_id or not event_id:
+            bib_index.loaded_at = None
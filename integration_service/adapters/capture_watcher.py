@@ -0,0 +1,259 @@
+"""Module for watching capture folders for new video files."""
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+
+from .photos_file_adapter import PhotosFileAdapter
+
+# inotify is used when available, set WATCH_MODE=polling to force directory scans
+WATCH_MODE = os.getenv("WATCH_MODE", "inotify")
+# files found by scanning must be unchanged for this long before they are processed
+WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "2"))
+# files still being written to the raw capture folder
+WATCH_IGNORE_PREFIXES = tuple(os.getenv("WATCH_IGNORE_PREFIXES", "TMP").split(","))
+
+# from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+
+def get_inotify_libc() -> ctypes.CDLL:
+    """Load libc with inotify functions, raise OSError if not supported."""
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        msg = "libc not found"
+        raise OSError(msg)
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        msg = "inotify not supported on this platform"
+        raise OSError(msg)
+    return libc
+
+
+class CaptureWatcher:
+    """Class representing queues of new, completely written files in capture folders.
+
+    With inotify, files are queued when the writer closes them (IN_CLOSE_WRITE)
+    or when they are moved into the folder (IN_MOVED_TO), so idle ticks do not
+    scan the folders. Files found by scanning - at startup, after an event queue
+    overflow or in polling mode - are only queued when size and modification
+    time have been stable for WATCH_SETTLE_SECONDS.
+    """
+
+    def __init__(
+        self, folders: list[str], ignore_prefixes: dict[str, tuple[str, ...]] | None = None
+    ) -> None:
+        """Initialize watcher, call start() from the running event loop.
+
+        Files in a folder with a name starting with one of its ignore_prefixes
+        are never queued.
+        """
+        self.folders = folders
+        self.ignore_prefixes = ignore_prefixes or {}
+        self.mode = "polling"
+        self.events = 0
+        self.scans = 0
+        self._fd = -1
+        self._watches: dict[int, str] = {}
+        self._ready: dict[str, dict[str, None]] = {folder: {} for folder in folders}
+        self._unsettled: dict[str, dict[str, tuple | None]] = {folder: {} for folder in folders}
+        self._rescan = set(folders)
+        self._changed = asyncio.Event()
+
+    def start(self) -> None:
+        """Start watching folders, fall back to polling if inotify is not available."""
+        for folder in self.folders:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+        if WATCH_MODE == "polling":
+            return
+        try:
+            self._start_inotify()
+        except OSError:
+            logging.warning("inotify not available, capture folders will be polled.")
+            self.stop()
+
+    def _start_inotify(self) -> None:
+        """Add inotify watches and register reader with the event loop."""
+        libc = get_inotify_libc()
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        for folder in self.folders:
+            wd = libc.inotify_add_watch(
+                self._fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO
+            )
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), folder)
+            self._watches[wd] = folder
+        asyncio.get_running_loop().add_reader(self._fd, self._read_events)
+        self.mode = "inotify"
+        logging.info(f"Watching capture folders with inotify: {self.folders}")
+
+    def stop(self) -> None:
+        """Stop watching, queued files are kept."""
+        if self._fd >= 0:
+            if self.mode == "inotify":
+                asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+        self._fd = -1
+        self._watches.clear()
+        self.mode = "polling"
+
+    def _read_events(self) -> None:
+        """Read pending inotify events and queue the files."""
+        try:
+            data = os.read(self._fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            self.events += 1
+            if mask & IN_Q_OVERFLOW:
+                logging.warning("inotify event queue overflow, capture folders will be scanned.")
+                self._rescan.update(self.folders)
+            elif mask & IN_IGNORED:
+                # folder removed or unmounted - scan it from now on
+                folder = self._watches.pop(wd, "")
+                if folder:
+                    logging.warning(f"Lost inotify watch on {folder}, folder will be polled.")
+                    self._rescan.add(folder)
+            elif wd in self._watches and name and not mask & IN_ISDIR:
+                self.queue_file(self._watches[wd], name)
+        self._changed.set()
+
+    def queue_file(self, folder: str, name: str) -> None:
+        """Queue file for processing, i.e. a file kept for retry."""
+        if not name.startswith(self.ignore_prefixes.get(folder, ())):
+            self._unsettled[folder].pop(name, None)
+            self._ready[folder][name] = None
+
+    def take_ready(self, folder: str) -> list[dict]:
+        """Take all queued files in folder that still exist.
+
+        Returns:
+            List of files with name and url (path)
+
+        """
+        if folder in self._rescan or folder not in self._watches.values():
+            self._scan(folder)
+        self._settle(folder)
+        ready = self._ready[folder]
+        self._ready[folder] = {}
+        return [
+            {"name": name, "url": f"{folder}/{name}"}
+            for name in ready
+            if Path(folder, name).is_file()
+        ]
+
+    def clear(self, folder: str) -> None:
+        """Forget queued files in a folder that is not processed.
+
+        The folder is scanned again on the next take_ready(), so files left in
+        it are still found when it is processed later.
+        """
+        self._ready[folder].clear()
+        self._rescan.add(folder)
+
+    def stats(self) -> dict:
+        """Get watcher counters."""
+        return {
+            "mode": self.mode,
+            "events": self.events,
+            "scans": self.scans,
+            "unsettled": sum(len(files) for files in self._unsettled.values()),
+        }
+
+    async def wait(self, max_wait: float) -> None:
+        """Wait until new files are queued, or max_wait seconds."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._changed.wait(), max_wait)
+        self._changed.clear()
+
+    def _scan(self, folder: str) -> None:
+        """Scan folder, new files must settle before they are queued."""
+        self._rescan.discard(folder)
+        self.scans += 1
+        try:
+            files = list(Path(folder).iterdir())
+        except OSError:
+            logging.exception(f"Error scanning capture folder {folder}")
+            return
+        unsettled = self._unsettled[folder]
+        for f in files:
+            if (
+                f.name not in unsettled
+                and f.name not in self._ready[folder]
+                and not f.name.startswith(self.ignore_prefixes.get(folder, ()))
+                and f.is_file()
+            ):
+                unsettled[f.name] = None
+
+    def _settle(self, folder: str) -> None:
+        """Queue scanned files with size and modification time unchanged since last check."""
+        unsettled = self._unsettled[folder]
+        now = time.time()
+        for name, previous in list(unsettled.items()):
+            try:
+                stat = Path(folder, name).stat()
+            except FileNotFoundError:
+                del unsettled[name]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if previous in (None, current) and now - stat.st_mtime >= WATCH_SETTLE_SECONDS:
+                del unsettled[name]
+                self._ready[folder][name] = None
+            else:
+                unsettled[name] = current
+
+
+_capture_watcher: CaptureWatcher | None = None
+
+
+def get_capture_watcher() -> CaptureWatcher:
+    """Return the watcher for CAPTURE and RAW_CAPTURE folders, start it on first use.
+
+    Must be called from within the running event loop.
+    """
+    global _capture_watcher  # noqa: PLW0603
+    if _capture_watcher is None:
+        raw_capture_folder = PhotosFileAdapter().get_raw_capture_folder_path()
+        _capture_watcher = CaptureWatcher(
+            [PhotosFileAdapter().get_capture_folder_path(), raw_capture_folder],
+            {raw_capture_folder: WATCH_IGNORE_PREFIXES},
+        )
+        _capture_watcher.start()
+    return _capture_watcher
+
+
+async def wait_for_capture_files(max_wait: float) -> None:
+    """Sleep until new capture files arrive, or max_wait seconds."""
+    if _capture_watcher is None or _capture_watcher.mode != "inotify":
+        await asyncio.sleep(max_wait)
+    else:
+        await _capture_watcher.wait(max_wait)
+
+
+def close_capture_watcher() -> None:
+    """Stop the capture folder watcher."""
+    global _capture_watcher  # noqa: PLW0603
+    if _capture_watcher is not None:
+        _capture_watcher.stop()
+    _capture_watcher = None
@@ -6,9 +6,11 @@ import os
 from http import HTTPStatus
 from pathlib import Path
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
+
 COMPETITION_FORMAT_HOST_SERVER = os.getenv(
     "COMPETITION_FORMAT_HOST_SERVER", "localhost"
 )
@@ -31,7 +33,7 @@ class CompetitionFormatAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{COMPETITION_FORMAT_SERVICE_URL}/competition-formats", headers=headers
         ) as resp:
             logging.debug(f"get_competition_formats - got response {resp.status}")
@@ -1,27 +1,122 @@
 """Module for config adapter."""
 
 import ast
+import asyncio
 import copy
 import json
 import logging
 import os
+import time
 from http import HTTPStatus
-from pathlib import Path
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .config_defaults import config_defaults
+from .http_client import get_session
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
-PROJECT_ROOT = f"{Path.cwd()}/integration_service"
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", "60"))
+# interval for conditional snapshot fetches while waiting for config changes
+CONFIG_POLL_INTERVAL = float(os.getenv("CONFIG_POLL_INTERVAL", "1"))
+
+# per event snapshot of all configs: event_id -> {key: value}
+_config_snapshots: dict[str, dict] = {}
+_config_snapshot_times: dict[str, float] = {}
+_config_snapshot_etags: dict[str, str] = {}
+_seeded_events: set[str] = set()
+
+
+def config_bool(string_value: str) -> bool:
+    """Convert config string value to boolean."""
+    return string_value in ["True", "true", "1"]
 
 
 class ConfigAdapter:
     """Class representing config."""
 
+    async def load_config_snapshot(self, token: str, event_id: str) -> dict:
+        """Load all configs for the event in one call and refresh the cache.
+
+        If the backend sent an ETag for the cached snapshot, the fetch is
+        conditional and an unchanged snapshot costs a 304 without body.
+        """
+        etag = _config_snapshot_etags.get(event_id, "") if event_id in _config_snapshots else ""
+        configs, etag = await self.get_all_configs_if_changed(token, event_id, etag)
+        _config_snapshot_times[event_id] = time.monotonic()
+        if configs is None:
+            return _config_snapshots[event_id]
+        snapshot = {}
+        for config in configs:
+            value = config["value"]
+            snapshot[config["key"]] = value.strip() if isinstance(value, str) else value
+        _config_snapshots[event_id] = snapshot
+        _config_snapshot_etags[event_id] = etag
+        logging.debug(f"Loaded config snapshot for event {event_id}, {len(snapshot)} keys.")
+        if event_id and event_id not in _seeded_events:
+            # first load for event - create all missing defaults at once
+            _seeded_events.add(event_id)
+            await self.seed_default_configs(token, event_id)
+        return snapshot
+
+    async def wait_for_config_change(self, token: str, event_id: str, max_wait: float) -> bool:
+        """Poll config snapshot with conditional fetches until it changes, or max_wait seconds.
+
+        Polls every CONFIG_POLL_INTERVAL seconds, at most every max_wait / 2
+        seconds, so a start command is picked up within about one interval.
+        An unchanged snapshot costs a 304 without body. Without ETag support
+        in the backend, every poll would fetch all configs, so then it just
+        sleeps.
+
+        Returns:
+            True if the snapshot changed
+
+        """
+        if not _config_snapshot_etags.get(event_id):
+            await asyncio.sleep(max_wait)
+            return False
+        previous = dict(_config_snapshots.get(event_id, {}))
+        deadline = time.monotonic() + max_wait
+        interval = min(CONFIG_POLL_INTERVAL, max_wait / 2)
+        while deadline - time.monotonic() > interval:
+            await asyncio.sleep(interval)
+            snapshot = await self.load_config_snapshot(token, event_id)
+            if snapshot != previous:
+                return True
+        await asyncio.sleep(max(deadline - time.monotonic(), 0))
+        return False
+
+    async def get_config_snapshot(self, token: str, event_id: str) -> dict:
+        """Get cached config snapshot, reload if missing or older than TTL."""
+        loaded_at = _config_snapshot_times.get(event_id)
+        if loaded_at is None or time.monotonic() - loaded_at > CONFIG_CACHE_TTL:
+            return await self.load_config_snapshot(token, event_id)
+        return _config_snapshots[event_id]
+
+    def invalidate_config_cache(self, event_id: str = "") -> None:
+        """Drop cached config snapshot for one event, or for all events."""
+        if event_id:
+            _config_snapshots.pop(event_id, None)
+            _config_snapshot_times.pop(event_id, None)
+            _config_snapshot_etags.pop(event_id, None)
+        else:
+            _config_snapshots.clear()
+            _config_snapshot_times.clear()
+            _config_snapshot_etags.clear()
+
+    def _write_through(self, event_id: str, key: str, value: str) -> None:
+        """Update cached snapshot after a successful write."""
+        if event_id in _config_snapshots:
+            _config_snapshots[event_id][key] = value.strip() if isinstance(value, str) else value
+
     async def get_config(self, token: str, event_id: str, key: str) -> str:
-        """Get config by key function."""
+        """Get config by key function - served from cached snapshot."""
+        snapshot = await self.get_config_snapshot(token, event_id)
+        if key in snapshot:
+            return snapshot[key]
+
         config = {}
         headers = MultiDict(
             [
@@ -31,7 +126,7 @@ class ConfigAdapter:
         )
         servicename = "get_config"
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{PHOTO_SERVICE_URL}/config?key={key}&eventId={event_id}",
             headers=headers,
         ) as resp:
@@ -41,51 +136,83 @@ class ConfigAdapter:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
             elif resp.status == HTTPStatus.NOT_FOUND:
-                # config not found - find default value
-                config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
-                with config_file.open() as json_file:
-                    try:
-                        settings = json.load(json_file)
-                    except json.JSONDecodeError as e:
-                        informasjon = f"Error decoding JSON from config file {config_file}: {e}"
-                        logging.exception(informasjon)
-                        raise web.HTTPBadRequest(reason=informasjon) from e
-                    if key in settings:
-                        value = settings[key]
-                        # create config
-                        await self.create_config(token, event_id, key, value)
-                        return value
-                informasjon = f"Config {key} not found in config file {config_file}."
-                logging.error(informasjon)
-                raise web.HTTPBadRequest(reason=informasjon)
+                # config not found - create from default value
+                return await self.create_default_config(token, event_id, key)
             else:
                 body = await resp.json()
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
                 logging.error(informasjon)
                 raise web.HTTPBadRequest(reason=informasjon)
+        self._write_through(event_id, key, config["value"])
         return config["value"].strip()
 
+    async def get_configs(
+        self, token: str, event_id: str, keys: list[str], refresh: bool = False
+    ) -> dict:
+        """Get configs for several keys from one snapshot fetch.
+
+        Keys missing in the snapshot are resolved concurrently, with defaults
+        from global_settings.json for keys not configured for the event.
+
+        Args:
+            token: Authentication token
+            event_id: Event id
+            keys: Config keys
+            refresh: Fetch snapshot even if cached snapshot is within TTL
+
+        Returns:
+            Dictionary with value per key
+
+        """
+        if refresh:
+            snapshot = await self.load_config_snapshot(token, event_id)
+        else:
+            snapshot = await self.get_config_snapshot(token, event_id)
+        missing = [key for key in keys if key not in snapshot]
+        values = await asyncio.gather(
+            *(self.get_config(token, event_id, key) for key in missing)
+        )
+        resolved = dict(zip(missing, values, strict=True))
+        return {key: snapshot[key] if key in snapshot else resolved[key] for key in keys}
+
     async def get_all_configs(self, token: str, event_id: str) -> list:
         """Get config by google id function."""
-        config = []
+        config, _ = await self.get_all_configs_if_changed(token, event_id, "")
+        return config
+
+    async def get_all_configs_if_changed(
+        self, token: str, event_id: str, etag: str
+    ) -> tuple[list | None, str]:
+        """Get all configs, unless they still match etag.
+
+        Returns:
+            Tuple with configs (None if not modified) and the ETag of the response
+
+        """
+        config = None
         headers = MultiDict(
             [
                 (hdrs.CONTENT_TYPE, "application/json"),
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
+        if etag:
+            headers.add(hdrs.IF_NONE_MATCH, etag)
         servicename = "get_all_configs"
         if event_id:
             url = f"{PHOTO_SERVICE_URL}/configs?eventId={event_id}"
         else:
             url = f"{PHOTO_SERVICE_URL}/configs"
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             url,
             headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.OK:
                 config = await resp.json()
+                etag = resp.headers.get(hdrs.ETAG, "")
+            elif resp.status == HTTPStatus.NOT_MODIFIED:
+                logging.debug(f"{servicename} - not modified")
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -94,16 +221,12 @@ class ConfigAdapter:
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
                 logging.error(informasjon)
                 raise web.HTTPBadRequest(reason=informasjon)
-        return config
+        return config, etag
 
     async def get_config_bool(self, token: str, event_id: str, key: str) -> bool:
         """Get config boolean value."""
         string_value = await self.get_config(token, event_id, key)
-        boolean_value = False
-        if string_value in ["True", "true", "1"]:
-            boolean_value = True
-
-        return boolean_value
+        return config_bool(string_value)
 
     async def get_config_int(self, token: str, event_id: str, key: str) -> int:
         """Get config int value."""
@@ -139,6 +262,41 @@ class ConfigAdapter:
         # convert from json string to list
         return json.loads(string_value)
 
+    async def create_default_config(self, token: str, event_id: str, key: str) -> str:
+        """Create config for event with default value from global_settings.json."""
+        value = config_defaults.get_default(key)
+        if value is None:
+            informasjon = f"Config {key} not found in config file {config_defaults.settings_file}."
+            logging.error(informasjon)
+            raise web.HTTPBadRequest(reason=informasjon)
+        await self.create_config(token, event_id, key, value)
+        return value
+
+    async def seed_default_configs(self, token: str, event_id: str) -> int:
+        """Create all default configs missing for the event in one concurrent batch.
+
+        Returns:
+            Number of configs created
+
+        """
+        snapshot = _config_snapshots.get(event_id, {})
+        missing = {
+            key: value
+            for key, value in config_defaults.get_defaults().items()
+            if key not in snapshot
+        }
+        results = await asyncio.gather(
+            *(self.create_config(token, event_id, key, value) for key, value in missing.items()),
+            return_exceptions=True,
+        )
+        for key, result in zip(missing, results, strict=True):
+            if isinstance(result, BaseException):
+                logging.error(f"Error creating default config {key}: {result}")
+        created = sum(not isinstance(result, BaseException) for result in results)
+        if missing:
+            logging.info(f"Seeded {created} of {len(missing)} default configs for event {event_id}.")
+        return created
+
     async def create_config(
         self, token: str, event_id: str, key: str, value: str
     ) -> str:
@@ -158,13 +316,14 @@ class ConfigAdapter:
         }
         request_body = copy.deepcopy(config)
 
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
                 logging.debug(f"result - got response {resp}")
                 location = resp.headers[hdrs.LOCATION]
                 result = location.split(os.path.sep)[-1]
+                self._write_through(event_id, key, value)
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -183,6 +342,16 @@ class ConfigAdapter:
         new_value_str = json.dumps(new_value)
         return await self.update_config(token, event_id, key, new_value_str)
 
+    async def update_config_if_changed(
+        self, token: str, event_id: str, key: str, new_value: str
+    ) -> bool:
+        """Update config only if the cached value differs, return True if it was written."""
+        snapshot = await self.get_config_snapshot(token, event_id)
+        if snapshot.get(key) == new_value:
+            return False
+        await self.update_config(token, event_id, key, new_value)
+        return True
+
     async def update_config(
         self, token: str, event_id: str, key: str, new_value: str
     ) -> str:
@@ -201,25 +370,16 @@ class ConfigAdapter:
             "value": new_value,
         }
 
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
         ) as resp:
             response = str(resp.status)
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"update config - got response {resp}")
+                self._write_through(event_id, key, new_value)
             elif resp.status == HTTPStatus.NOT_FOUND:
-                # config not found - find default value
-                config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
-                with config_file.open() as json_file:
-                    settings = json.load(json_file)
-                    if key in settings:
-                        value = settings[key]
-                        # create config
-                        await self.create_config(token, event_id, key, value)
-                        return value
-                informasjon = f"Config {key} not found in config file {config_file}."
-                logging.error(informasjon)
-                raise web.HTTPBadRequest(reason=informasjon)
+                # config not found - create from default value
+                return await self.create_default_config(token, event_id, key)
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
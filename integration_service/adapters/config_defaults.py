@@ -0,0 +1,71 @@
+"""Module for default config values."""
+
+import json
+import logging
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+from aiohttp import web
+
+PROJECT_ROOT = f"{Path.cwd()}/integration_service"
+GLOBAL_SETTINGS_FILE = os.getenv(
+    "GLOBAL_SETTINGS_FILE", f"{PROJECT_ROOT}/config/global_settings.json"
+)
+# reload defaults when the settings file is modified
+CONFIG_DEFAULTS_RELOAD = os.getenv("CONFIG_DEFAULTS_RELOAD", "True") in ["True", "true", "1"]
+
+ConfigValue = str | int | float | bool
+
+
+class ConfigDefaults:
+    """Class representing read-only default config values from global_settings.json.
+
+    The file is read on first use, and again only if its modification time
+    has changed (when CONFIG_DEFAULTS_RELOAD is set).
+    """
+
+    def __init__(self, settings_file: str, reload: bool) -> None:
+        """Initialize registry, the file is read on first use."""
+        self.settings_file = Path(settings_file)
+        self.reload = reload
+        self._defaults: Mapping[str, ConfigValue] = MappingProxyType({})
+        self._mtime_ns: int | None = None
+
+    def get_defaults(self) -> Mapping[str, ConfigValue]:
+        """Get all default values, reload if the file has changed."""
+        if self._mtime_ns is None or self.reload:
+            try:
+                mtime_ns = self.settings_file.stat().st_mtime_ns
+            except OSError as e:
+                if self._mtime_ns is not None:
+                    logging.exception(f"Config file {self.settings_file} not readable, keeping defaults.")
+                    return self._defaults
+                informasjon = f"Config file {self.settings_file} not found: {e}"
+                raise web.HTTPBadRequest(reason=informasjon) from e
+            if mtime_ns != self._mtime_ns:
+                self._load(mtime_ns)
+        return self._defaults
+
+    def get_default(self, key: str) -> ConfigValue | None:
+        """Get default value for key, None if key has no default."""
+        return self.get_defaults().get(key)
+
+    def _load(self, mtime_ns: int) -> None:
+        """Read settings file, keep previous defaults if it is invalid."""
+        try:
+            settings = json.loads(self.settings_file.read_text())
+        except json.JSONDecodeError as e:
+            informasjon = f"Error decoding JSON from config file {self.settings_file}: {e}"
+            logging.exception(informasjon)
+            if self._mtime_ns is None:
+                raise web.HTTPBadRequest(reason=informasjon) from e
+            self._mtime_ns = mtime_ns
+            return
+        self._defaults = MappingProxyType(dict(settings))
+        self._mtime_ns = mtime_ns
+        logging.debug(f"Loaded {len(settings)} config defaults from {self.settings_file}.")
+
+
+config_defaults = ConfigDefaults(GLOBAL_SETTINGS_FILE, CONFIG_DEFAULTS_RELOAD)
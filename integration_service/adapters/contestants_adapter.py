@@ -7,9 +7,10 @@ import urllib.parse
 from http import HTTPStatus
 from typing import Any
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
 from .raceclasses_adapter import RaceclassesAdapter
 from .start_adapter import StartAdapter
 
@@ -27,7 +28,7 @@ class ContestantsAdapter:
         headers = MultiDict([(hdrs.AUTHORIZATION, f"Bearer {token}")])
 
         url = f"{EVENT_SERVICE_URL}/events/{event_id}/contestants/assign-bibs"
-        async with ClientSession() as session, session.post(url, headers=headers) as resp:
+        async with get_session().post(url, headers=headers) as resp:
             res = resp.status
             logging.debug(f"assign_bibs result - got response {resp}")
             if res == HTTPStatus.CREATED:
@@ -54,7 +55,7 @@ class ContestantsAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants",
             headers=headers,
             json=request_body,
@@ -78,7 +79,7 @@ class ContestantsAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
         logging.debug(f"Create contestants - got file {inputfile}")
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants",
             headers=headers,
             data=inputfile,
@@ -120,7 +121,7 @@ class ContestantsAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
 
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants",
             headers=headers,
         ) as resp:
@@ -160,7 +161,7 @@ class ContestantsAdapter:
         headers = {
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants/{contestant['id']}",
             headers=headers,
         ) as resp:
@@ -203,7 +204,7 @@ class ContestantsAdapter:
             ]
         )
         contestants = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants", headers=headers
         ) as resp:
             logging.debug(f"get_all_contestants - got response {resp.status}")
@@ -231,7 +232,7 @@ class ContestantsAdapter:
         contestants = []
         ageclass_name_url = urllib.parse.quote(ageclass_name, safe="")
         query_param = f"ageclass={ageclass_name_url}"
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants?{query_param}",
             headers=headers,
         ) as resp:
@@ -259,7 +260,7 @@ class ContestantsAdapter:
         )
         contestants = []
         raceclass_name_url = urllib.parse.quote(raceclass_name, safe="")
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants?raceclass={raceclass_name_url}",
             headers=headers,
         ) as resp:
@@ -288,7 +289,7 @@ class ContestantsAdapter:
             ]
         )
         contestant = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants?bib={bib}",
             headers=headers,
         ) as resp:
@@ -320,7 +321,7 @@ class ContestantsAdapter:
         )
         contestants = []
         raceclass_url = urllib.parse.quote(raceclass, safe="")
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants?raceclass={raceclass_url}",
             headers=headers,
         ) as resp:
@@ -349,7 +350,7 @@ class ContestantsAdapter:
             ]
         )
         contestant = {}
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants/{contestant_id}",
             headers=headers,
         ) as resp:
@@ -378,7 +379,7 @@ class ContestantsAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{EVENT_SERVICE_URL}/events/{event_id}/contestants/search",
             headers=headers,
             json=request_body,
@@ -425,7 +426,7 @@ class ContestantsAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.put(url, headers=headers, json=request_body) as resp:
+        async with get_session().put(url, headers=headers, json=request_body) as resp:
             res = resp.status
             if res == HTTPStatus.NO_CONTENT:
                 logging.debug(f"result - got response {resp}")
@@ -9,10 +9,11 @@ from http import HTTPStatus
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
 from .competition_format_adapter import CompetitionFormatAdapter
+from .http_client import get_session
 
 EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER", "localhost")
 EVENTS_HOST_PORT = os.getenv("EVENTS_HOST_PORT", "8082")
@@ -31,7 +32,7 @@ class EventsAdapter:
             ]
         )
         url = f"{EVENT_SERVICE_URL}/events/{event_id}/generate-raceclasses"
-        async with ClientSession() as session, session.post(url, headers=headers) as resp:
+        async with get_session().post(url, headers=headers) as resp:
             res = resp.status
             logging.debug(f"generate_raceclasses result - got response {resp}")
             if res == HTTPStatus.CREATED:
@@ -57,7 +58,7 @@ class EventsAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events", headers=headers
         ) as resp:
             logging.debug(f"get_all_events - got response {resp.status}")
@@ -82,7 +83,7 @@ class EventsAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{my_id}", headers=headers
         ) as resp:
             logging.debug(f"get_event {my_id} - got response {resp.status}")
@@ -167,7 +168,7 @@ class EventsAdapter:
         )
         request_body = copy.deepcopy(event)
 
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
                 f"{EVENT_SERVICE_URL}/events", headers=headers, json=request_body
             ) as resp:
                 if resp.status == HTTPStatus.CREATED:
@@ -195,7 +196,7 @@ class EventsAdapter:
             ]
         )
         url = f"{EVENT_SERVICE_URL}/events/{my_id}"
-        async with ClientSession() as session, session.delete(url, headers=headers) as resp:
+        async with get_session().delete(url, headers=headers) as resp:
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"result - got response {resp}")
             else:
@@ -216,7 +217,7 @@ class EventsAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{EVENT_SERVICE_URL}/events/{my_id}", headers=headers, json=request_body
         ) as resp:
             result = resp.status
@@ -8,3 +8,11 @@ class VideoStreamNotFoundError(Exception):
         """Initialize the error."""
         # Call the base class constructor with the parameters it needs
         super().__init__(message)
+
+
+class BackendUnavailableError(Exception):
+    """Class representing a temporary backend failure, after retries or with open circuit."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
@@ -1,20 +1,132 @@
 """Module for google cloud storage adapter."""
 
+import json
 import logging
+import mimetypes
 import os
+import threading
+from http import HTTPStatus
 from pathlib import Path
+from typing import Any, cast
 
+import google.auth
 from dotenv import load_dotenv
-from google.api_core.exceptions import Forbidden, NotFound
+from google.api_core.exceptions import Forbidden, GoogleAPICallError, NotFound
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
 load_dotenv()
 GOOGLE_STORAGE_BUCKET = os.getenv("GOOGLE_STORAGE_BUCKET")
 GOOGLE_STORAGE_SERVER = os.getenv("GOOGLE_STORAGE_SERVER")
+GOOGLE_STORAGE_POOL_SIZE = int(os.getenv("GOOGLE_STORAGE_POOL_SIZE", "10"))
+# chunks of resumable uploads must be a multiple of 256 KiB
+GOOGLE_STORAGE_CHUNK_SIZE = max(
+    int(os.getenv("GOOGLE_STORAGE_CHUNK_SIZE", str(8 * 1024 * 1024))) // (256 * 1024), 1
+) * 256 * 1024
+GOOGLE_STORAGE_UPLOAD_TIMEOUT = float(os.getenv("GOOGLE_STORAGE_UPLOAD_TIMEOUT", "120"))
+# failed attempts before an interrupted upload is given up
+GOOGLE_STORAGE_UPLOAD_ATTEMPTS = int(os.getenv("GOOGLE_STORAGE_UPLOAD_ATTEMPTS", "5"))
+UPLOAD_SESSION_PATH = os.getenv(
+    "UPLOAD_SESSION_PATH", f"{Path.cwd()}/integration_service/files/upload_sessions"
+)
 if GOOGLE_STORAGE_BUCKET == "" or GOOGLE_STORAGE_SERVER == "":
     err_msg = "GOOGLE_STORAGE_BUCKET or GOOGLE_STORAGE_SERVER not found in .env"
     raise Exception(err_msg)
 
+_storage_bucket: storage.Bucket | None = None
+_storage_session: AuthorizedSession | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage_bucket() -> storage.Bucket:
+    """Return shared bucket handle, create client and bucket on first use.
+
+    The client is reused by all adapter calls and threads. It sends requests
+    through an authorized session with a connection pool sized by
+    GOOGLE_STORAGE_POOL_SIZE.
+    """
+    global _storage_bucket, _storage_session  # noqa: PLW0603
+    with _storage_lock:
+        if _storage_bucket is None:
+            credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+            _storage_session = AuthorizedSession(credentials)
+            pool_adapter = HTTPAdapter(
+                pool_connections=GOOGLE_STORAGE_POOL_SIZE,
+                pool_maxsize=GOOGLE_STORAGE_POOL_SIZE,
+            )
+            _storage_session.mount("https://", pool_adapter)
+            storage_client = storage.Client(
+                project=project, credentials=credentials, _http=_storage_session
+            )
+            _storage_bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+        return _storage_bucket
+
+
+def get_storage_session() -> AuthorizedSession:
+    """Return the authorized http session shared by the storage client."""
+    get_storage_bucket()
+    return cast("AuthorizedSession", _storage_session)
+
+
+def get_upload_state_file(destination_blob_name: str) -> Path:
+    """Get path to persisted session state for upload to destination blob."""
+    return Path(UPLOAD_SESSION_PATH) / f"{destination_blob_name.replace('/', '_')}.json"
+
+
+def read_upload_state(state_file: Path) -> dict:
+    """Read persisted upload session state, empty dict if missing or invalid."""
+    try:
+        return json.loads(state_file.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def write_upload_state(state_file: Path, state: dict) -> None:
+    """Persist upload session state."""
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(json.dumps(state))
+
+
+def record_failed_upload_attempt(state_file: Path, state: dict) -> None:
+    """Count failed upload attempt, drop the session after GOOGLE_STORAGE_UPLOAD_ATTEMPTS."""
+    attempts = state.get("attempts", 0) + 1
+    if attempts >= GOOGLE_STORAGE_UPLOAD_ATTEMPTS:
+        logging.warning(f"Upload to {state.get('destination')} failed {attempts} times, giving up.")
+        state_file.unlink(missing_ok=True)
+    else:
+        write_upload_state(state_file, {**state, "attempts": attempts})
+
+
+def is_retryable_upload_status(status_code: int) -> bool:
+    """Check if a chunk upload rejected with status code may succeed when retried."""
+    return (
+        status_code in [HTTPStatus.REQUEST_TIMEOUT, HTTPStatus.TOO_MANY_REQUESTS]
+        or status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+    )
+
+
+def committed_bytes(range_header: str) -> int:
+    """Get number of committed bytes from resumable upload Range header (bytes=0-N)."""
+    if not range_header:
+        return 0
+    return int(range_header.rsplit("-", maxsplit=1)[-1]) + 1
+
+
+def get_upload_offset(transport: Any, session_url: str, total_bytes: int) -> int:
+    """Ask upload session how many bytes are committed, -1 if session is gone."""
+    resp = transport.put(
+        session_url,
+        headers={"Content-Range": f"bytes */{total_bytes}"},
+        timeout=GOOGLE_STORAGE_UPLOAD_TIMEOUT,
+    )
+    if resp.status_code in [HTTPStatus.OK, HTTPStatus.CREATED]:
+        return total_bytes
+    if resp.status_code == HTTPStatus.PERMANENT_REDIRECT:
+        return committed_bytes(resp.headers.get("Range", ""))
+    logging.info(f"Upload session no longer valid - {resp.status_code}")
+    return -1
+
 
 class GoogleCloudStorageAdapter:
 
@@ -26,19 +138,16 @@ class GoogleCloudStorageAdapter:
             destination_folder: str,
             source_file_name: str,
         ) -> str:
-        """Upload a file to the bucket, return URL to uploaded file."""
+        """Upload a file to the bucket with a resumable upload, return URL to uploaded file."""
         servicename = "GoogleCloudStorageAdapter.upload_blob"
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
             destination_blob_name = f"{Path(source_file_name).name}"
             if destination_folder != "":
                 destination_blob_name = (
                     f"{event_id}/{destination_folder}/{Path(source_file_name).name}"
                 )
-            blob = bucket.blob(destination_blob_name)
-            blob.upload_from_filename(source_file_name)
+            self.upload_blob_resumable(source_file_name, destination_blob_name)
         except Exception as e:
             logging.exception(servicename)
             raise Exception(servicename) from e
@@ -46,6 +155,108 @@ class GoogleCloudStorageAdapter:
             f"{GOOGLE_STORAGE_SERVER}/{GOOGLE_STORAGE_BUCKET}/{destination_blob_name}"
         )
 
+    def has_pending_upload(
+            self,
+            event_id: str,
+            destination_folder: str,
+            source_file_name: str,
+        ) -> bool:
+        """Check if an interrupted resumable upload of the file can be continued."""
+        destination_blob_name = f"{event_id}/{destination_folder}/{Path(source_file_name).name}"
+        return get_upload_state_file(destination_blob_name).exists()
+
+    def upload_blob_resumable(
+            self,
+            source_file_name: str,
+            destination_blob_name: str,
+        ) -> None:
+        """Upload a file in chunks through a resumable upload session.
+
+        The session is stored in UPLOAD_SESSION_PATH until the upload is
+        complete, so an interrupted upload continues from the last committed
+        byte on the next attempt, also after a restart. Files smaller than one
+        chunk are sent in a single request through the same session. The
+        session is dropped when it or a chunk is rejected with a non-retryable
+        status, or after GOOGLE_STORAGE_UPLOAD_ATTEMPTS failed attempts.
+        """
+        source_file = Path(source_file_name)
+        file_stat = source_file.stat()
+        total_bytes = file_stat.st_size
+        state_file = get_upload_state_file(destination_blob_name)
+        transport = get_storage_session()
+
+        file_state = {
+            "destination": destination_blob_name,
+            "size": total_bytes,
+            "mtime": file_stat.st_mtime,
+        }
+        state = read_upload_state(state_file)
+        if any(state.get(key) != value for key, value in file_state.items()):
+            state = {**file_state, "attempts": 0}
+        # state is written before the first request, so a failed attempt is always counted
+        write_upload_state(state_file, state)
+
+        try:
+            offset = -1
+            if "session_url" in state:
+                offset = get_upload_offset(transport, state["session_url"], total_bytes)
+                logging.info(f"Resuming upload of {source_file.name} from byte {offset}.")
+            if offset < 0:
+                # no valid session - start a new one, failed attempts of the same file still count
+                blob = get_storage_bucket().blob(destination_blob_name)
+                state["session_url"] = blob.create_resumable_upload_session(
+                    content_type=mimetypes.guess_type(source_file.name)[0],
+                    size=total_bytes,
+                )
+                write_upload_state(state_file, state)
+                offset = 0
+            self.upload_chunks(
+                transport, source_file, state["session_url"], offset, state_file=state_file
+            )
+        except Exception as e:
+            if isinstance(e, GoogleAPICallError) and e.code and not is_retryable_upload_status(e.code):
+                state_file.unlink(missing_ok=True)
+            if state_file.exists():
+                record_failed_upload_attempt(state_file, state)
+            raise
+        state_file.unlink(missing_ok=True)
+
+    def upload_chunks(
+            self,
+            transport: Any,
+            source_file: Path,
+            session_url: str,
+            offset: int,
+            *,
+            state_file: Path,
+        ) -> None:
+        """Upload file from offset to a resumable upload session, chunk by chunk.
+
+        A chunk rejected with a non-retryable status removes the session state,
+        so the upload is not resumed.
+        """
+        total_bytes = source_file.stat().st_size
+        with source_file.open("rb") as stream:
+            while offset < total_bytes:
+                stream.seek(offset)
+                chunk = stream.read(GOOGLE_STORAGE_CHUNK_SIZE)
+                end = offset + len(chunk) - 1
+                resp = transport.put(
+                    session_url,
+                    data=chunk,
+                    headers={"Content-Range": f"bytes {offset}-{end}/{total_bytes}"},
+                    timeout=GOOGLE_STORAGE_UPLOAD_TIMEOUT,
+                )
+                if resp.status_code in [HTTPStatus.OK, HTTPStatus.CREATED]:
+                    offset = total_bytes
+                elif resp.status_code == HTTPStatus.PERMANENT_REDIRECT:
+                    offset = committed_bytes(resp.headers.get("Range", ""))
+                else:
+                    if not is_retryable_upload_status(resp.status_code):
+                        state_file.unlink(missing_ok=True)
+                    err_msg = f"Upload of {source_file.name} failed at byte {offset} - {resp.status_code}"
+                    raise Exception(err_msg)
+
     def upload_blob_bytes(
             self,
             event_id: str,
@@ -58,8 +269,7 @@ class GoogleCloudStorageAdapter:
         """Upload a byte object to the bucket, return URL to uploaded file."""
         servicename = "GoogleCloudStorageAdapter.upload_blob_bytes"
 
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+        bucket = get_storage_bucket()
 
         try:
             destination_blob_name = (
@@ -89,8 +299,7 @@ class GoogleCloudStorageAdapter:
         servicename = "GoogleCloudStorageAdapter.move_blob"
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+            bucket = get_storage_bucket()
             blob = bucket.blob(source_blob_name)
             new_blob = bucket.rename_blob(blob, destination_blob_name)
         except Exception as e:
@@ -124,23 +333,17 @@ class GoogleCloudStorageAdapter:
             logging.exception("Error moving photo to archive.")
         return destination_file
 
-    def move_to_detect_archive(self, event_id: str, filename: str) -> str:
-        """Move photo to local archive."""
-        destination_file = f"{event_id}/DETECT_ARCHIVE/{filename}"
-        try:
-            self.move_blob(
-                f"{event_id}/DETECT/{filename}",
-                destination_file,
-            )
-        except Exception:
-            logging.exception("Error moving photo to archive.")
-        return destination_file
+    def move_detect_blob(self, event_id: str, filename: str, destination_folder: str) -> str:
+        """Move detected photo from DETECT to destination folder, raise exception on error."""
+        return self.move_blob(
+            f"{event_id}/DETECT/{filename}",
+            f"{event_id}/{destination_folder}/{filename}",
+        )
 
     def list_blobs(self, event_id: str, prefix: str) -> list[dict]:
         """List all blobs in the bucket that begin with the prefix."""
         servicename = "GoogleCloudStorageAdapter.list_blobs"
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+        bucket = get_storage_bucket()
 
         try:
             blobs = list(bucket.list_blobs(prefix=f"{event_id}/{prefix}"))
@@ -162,20 +365,29 @@ class GoogleCloudStorageAdapter:
             logging.exception(servicename)
             raise Exception(servicename) from e
 
-    def list_detect_blobs(self, event_id: str, max_results: int) -> list[dict]:
-        """List all detected blobs in the bucket."""
-        servicename = "GoogleCloudStorageAdapter.list_detect_blobs"
+    def list_detect_blobs_page(
+            self,
+            event_id: str,
+            page_size: int,
+            page_token: str = "",
+        ) -> tuple[list[dict], str]:
+        """List one page of detected blobs, return detections and token for next page.
+
+        The returned page token is empty when there are no more pages.
+        """
+        servicename = "GoogleCloudStorageAdapter.list_detect_blobs_page"
         detect_blobs = []
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+        bucket = get_storage_bucket()
 
         try:
-            all_detected_blobs = list(bucket.list_blobs(
-                max_results=max_results,
+            iterator = bucket.list_blobs(
+                page_size=page_size,
+                page_token=page_token or None,
                 prefix=f"{event_id}/DETECT/"
-            ))
+            )
+            page = next(iterator.pages, [])
 
-            for blob in all_detected_blobs:
+            for blob in page:
                 if blob.metadata:
                     metadata = blob.metadata
                     if metadata["image_type"] == "detection":
@@ -186,9 +398,12 @@ class GoogleCloudStorageAdapter:
                             "url": blob.public_url,
                             "crop_name": blob.name.replace(".jpg", "_crop.jpg"),
                             "crop_url": crop_url,
+                            "md5_hash": blob.md5_hash,
+                            "generation": blob.generation,
                             "metadata": metadata
                         }
                         detect_blobs.append(detection)
+            next_page_token = iterator.next_page_token or ""
 
         except Forbidden as e:
             informasjon = f"{servicename} Access denied listing blobs for {bucket.name}"
@@ -202,15 +417,28 @@ class GoogleCloudStorageAdapter:
             logging.exception(servicename)
             raise Exception(servicename) from e
 
-        return detect_blobs
+        return detect_blobs, next_page_token
+
+    def count_detect_blobs(self, event_id: str, page_token: str = "") -> int:
+        """Count blobs in DETECT from page token on, only blob names are listed."""
+        servicename = "GoogleCloudStorageAdapter.count_detect_blobs"
+        try:
+            iterator = get_storage_bucket().list_blobs(
+                page_token=page_token or None,
+                prefix=f"{event_id}/DETECT/",
+                fields="items(name),nextPageToken",
+            )
+            return sum(1 for _ in iterator)
+        except Exception as e:
+            logging.exception(servicename)
+            raise Exception(servicename) from e
 
     def delete_blob(self, blob_name: str) -> None:
         """Delete a blob in the bucket."""
         servicename = "GoogleCloudStorageAdapter.delete_blob"
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(GOOGLE_STORAGE_BUCKET)
+            bucket = get_storage_bucket()
             blob = bucket.blob(blob_name)
             blob.delete()
         except Exception as e:
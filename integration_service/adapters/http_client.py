@@ -0,0 +1,97 @@
+"""Module for shared http client session."""
+
+import logging
+import os
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from aiohttp import (
+    AsyncResolver,
+    ClientHandlerType,
+    ClientRequest,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    hdrs,
+)
+
+from .resilience import resilience_middleware
+
+if TYPE_CHECKING:
+    from .token_manager import TokenManager
+
+HTTP_CONNECTION_LIMIT = int(os.getenv("HTTP_CONNECTION_LIMIT", "100"))
+HTTP_CONNECTION_LIMIT_PER_HOST = int(os.getenv("HTTP_CONNECTION_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "60"))
+
+_session: ClientSession | None = None
+_token_manager: "TokenManager | None" = None
+
+
+def set_token_manager(token_manager: "TokenManager | None") -> None:
+    """Let the shared session authorize requests with tokens from token_manager."""
+    global _token_manager  # noqa: PLW0603
+    _token_manager = token_manager
+
+
+async def auth_middleware(request: ClientRequest, handler: ClientHandlerType) -> ClientResponse:
+    """Send requests with a bearer token using the current token, retry once on 401.
+
+    Requests without Authorization header (i.e. login) are passed through unchanged.
+    """
+    if _token_manager is None or hdrs.AUTHORIZATION not in request.headers:
+        return await handler(request)
+    token = await _token_manager.get_token()
+    request.headers[hdrs.AUTHORIZATION] = f"Bearer {token}"
+    response = await handler(request)
+    if response.status != HTTPStatus.UNAUTHORIZED:
+        return response
+    try:
+        new_token = await _token_manager.refresh(token)
+    except Exception:
+        logging.exception("Token refresh after 401 failed.")
+        return response
+    response.release()
+    request.headers[hdrs.AUTHORIZATION] = f"Bearer {new_token}"
+    response = await handler(request)
+    if response.status == HTTPStatus.UNAUTHORIZED:
+        _token_manager.invalidate(new_token)
+    return response
+
+
+def get_session() -> ClientSession:
+    """Return the process-wide http session, create it on first use.
+
+    All adapters share this session, so connections to the backend services
+    are pooled and kept alive between calls. Must be called from within the
+    running event loop.
+    """
+    global _session  # noqa: PLW0603
+    if _session is None or _session.closed:
+        connector = TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            resolver=AsyncResolver(),
+        )
+        _session = ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=HTTP_TOTAL_TIMEOUT),
+            # auth is outermost - a 401 retry also gets transient error retries
+            middlewares=(auth_middleware, resilience_middleware),
+        )
+        logging.debug("Created shared http session.")
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared http session and release pooled connections."""
+    global _session  # noqa: PLW0603
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logging.debug("Closed shared http session.")
+    _session = None
@@ -5,9 +5,11 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
@@ -33,7 +35,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(url, headers=headers) as resp:
+        async with get_session().get(url, headers=headers) as resp:
             if resp.status == HTTPStatus.OK:
                 photos = await resp.json()
                 logging.debug(f"photos - got response {photos}")
@@ -55,7 +57,7 @@ class PhotosAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{PHOTO_SERVICE_URL}/photos/{my_id}", headers=headers
         ) as resp:
             logging.debug(f"get_photo {my_id} - got response {resp.status}")
@@ -92,7 +94,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(url, headers=headers) as resp:
+        async with get_session().get(url, headers=headers) as resp:
             if resp.status == HTTPStatus.OK:
                 photos = await resp.json()
                 logging.debug(f"photos - got response {photos}")
@@ -125,7 +127,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(url, headers=headers) as resp:
+        async with get_session().get(url, headers=headers) as resp:
             logging.debug(
                 f"get_photos_by_raceclass - got response {resp.status}"
             )
@@ -149,7 +151,7 @@ class PhotosAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{PHOTO_SERVICE_URL}/photos?gBaseUrl={g_base_url}", headers=headers
         ) as resp:
             logging.debug(
@@ -181,7 +183,7 @@ class PhotosAdapter:
         )
         request_body = copy.deepcopy(photo)
 
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{PHOTO_SERVICE_URL}/photos", headers=headers, json=request_body
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
@@ -209,7 +211,7 @@ class PhotosAdapter:
             ]
         )
         url = f"{PHOTO_SERVICE_URL}/photos/{my_id}"
-        async with ClientSession() as session, session.delete(url, headers=headers) as resp:
+        async with get_session().delete(url, headers=headers) as resp:
             logging.debug(f"Delete photo: {my_id} - res {resp.status}")
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"result - got response {resp}")
@@ -229,7 +231,7 @@ class PhotosAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{PHOTO_SERVICE_URL}/photos/{my_id}", headers=headers, json=request_body
         ) as resp:
             result = resp.status
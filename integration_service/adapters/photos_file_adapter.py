@@ -1,7 +1,6 @@
 """Module adapter for photos on file storage."""
 
 import logging
-import subprocess
 from pathlib import Path
 
 from integration_service.adapters.google_cloud_storage_adapter import (
@@ -13,6 +12,7 @@ CAPTURED_FILE_PATH = f"{VISION_ROOT_PATH}/CAPTURE"
 CAPTURED_RAW_FILE_PATH = f"{VISION_ROOT_PATH}/RAW_CAPTURE"
 CAPTURED_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/CAPTURE/archive"
 CAPTURED_ERROR_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/CAPTURE/error_archive"
+CAPTURED_RAW_ERROR_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/RAW_CAPTURE/error_archive"
 PHOTOS_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/archive"
 PHOTOS_URL_PATH = "files"
 
@@ -59,48 +59,6 @@ class PhotosFileAdapter:
             logging.exception("Error getting photos")
         return photos
 
-    def get_all_capture_files(self, event_id: str, storage_mode: str) ->  list[dict]:
-        """Get all url to all captured files on file directory."""
-        file_list = []
-        try:
-            if storage_mode == "cloud_storage":
-                file_list = GoogleCloudStorageAdapter().list_blobs(event_id, "CAPTURE/")
-            else:
-                # Local file system
-                files = list(Path(CAPTURED_FILE_PATH).iterdir())
-                file_list = [
-                    {"name": f.name, "url": f"{CAPTURED_FILE_PATH}/{f.name}"}
-                    for f in files
-                if f.is_file()
-                ]
-        except Exception:
-            informasjon = "Error getting captured files"
-            logging.exception(informasjon)
-            return []
-        else:
-            return file_list
-
-    def get_all_raw_capture_files(self, event_id: str, storage_mode: str) ->  list[dict]:
-        """Get all url to all raw captured files on file directory."""
-        file_list = []
-        try:
-            if storage_mode == "cloud_storage":
-                file_list = GoogleCloudStorageAdapter().list_blobs(event_id, "RAW_CAPTURE/")
-            else:
-                # Local file system
-                files = list(Path(CAPTURED_RAW_FILE_PATH).iterdir())
-                file_list = [
-                    {"name": f.name, "url": f"{CAPTURED_RAW_FILE_PATH}/{f.name}"}
-                    for f in files
-                    if f.is_file() and not f.name.startswith("TMP")
-                ]
-        except Exception:
-            informasjon = "Error getting captured files"
-            logging.exception(informasjon)
-            return []
-        else:
-            return file_list
-
     def get_all_files(self, prefix: str, suffix: str) -> list:
         """Get all url to all files on file directory with given prefix and suffix."""
         my_files = []
@@ -181,41 +139,72 @@ class PhotosFileAdapter:
             logging.exception(f"Error moving photo to error archive: {filename}")
         return destination_file.name
 
-    def convert_raw_to_mp4(self, input_file: str) -> None:
-        """Convert (and repair) a video file to MP4 using FFmpeg."""
+    def move_raw_to_error_archive(self, filename: str) -> str:
+        """Move raw captured video that could not be converted to error archive."""
+        source_file = Path(CAPTURED_RAW_FILE_PATH) / filename
+        destination_file = Path(CAPTURED_RAW_ERROR_ARCHIVE_PATH) / filename
+        try:
+            Path(CAPTURED_RAW_ERROR_ARCHIVE_PATH).mkdir(parents=True, exist_ok=True)
+            source_file.rename(destination_file)
+        except Exception:
+            logging.exception(f"Error moving raw video to error archive: {filename}")
+        return destination_file.name
+
+    def get_convert_output_path(self, input_file: str) -> Path:
+        """Get path to converted MP4 file for a raw video file."""
         # Validate file paths to prevent command injection (S603)
         # Ensure paths are resolved and don't contain shell metacharacters
         try:
             input_path = Path(input_file).resolve()
-            output_path = Path(CAPTURED_FILE_PATH) / input_path.name
+            return Path(CAPTURED_FILE_PATH) / input_path.name
         except (ValueError, OSError) as e:
             err_msg = f"Invalid file path provided: {e}"
             logging.exception(err_msg)
             raise ValueError(err_msg) from e
 
-        try:
-            # Build ffmpeg command with conditional audio handling
-            # Using -c:a aac if audio exists, otherwise ffmpeg will ignore it
-            command = [
-                "ffmpeg",
-                "-i", input_file,
-                "-c:v", "libx264",    # H.264 video codec
-                "-preset", "fast",     # Encoding speed preset
-                "-crf", "23",          # Constant Rate Factor (quality)
-                "-c:a", "aac",        # AAC audio codec (ignored if no audio stream)
-                "-b:a", "128k",        # Audio bitrate (ignored if no audio stream)
-                "-map", "0:v:0",       # Map first video stream
-                "-map", "0:a?",        # Map audio if present (? makes it optional)
-                str(output_path)
-            ]
-            subprocess.run(command, check=True)  # noqa: S603
-
-            # delete input file
-            input_path.unlink()
-            logging.debug(f"Deleted raw video file: {input_file}")
-
-        except subprocess.CalledProcessError as e:
-            informasjon = f"FFmpeg command failed with error for {input_file}"
-            logging.exception(informasjon)
-            raise Exception(informasjon) from e
-
+    def get_probe_command(self, input_file: str) -> list[str]:
+        """Get FFprobe command that prints the codec name of the first video stream."""
+        return [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=codec_name",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            input_file,
+        ]
+
+    def get_remux_command(self, input_file: str) -> tuple[list[str], Path]:
+        """Get FFmpeg command to repair and remux a video file to MP4 without re-encoding."""
+        output_path = self.get_convert_output_path(input_file)
+        command = [
+            "ffmpeg",
+            "-nostdin",
+            "-fflags", "+genpts",  # regenerate missing timestamps in raw streams
+            "-i", input_file,
+            "-map", "0:v:0",
+            "-map", "0:a?",
+            "-c", "copy",          # stream copy - no re-encoding
+            str(output_path)
+        ]
+        return command, output_path
+
+    def get_convert_command(self, input_file: str) -> tuple[list[str], Path]:
+        """Get FFmpeg command to convert (and repair) a video file to MP4, and the output path."""
+        output_path = self.get_convert_output_path(input_file)
+
+        # Build ffmpeg command with conditional audio handling
+        # Using -c:a aac if audio exists, otherwise ffmpeg will ignore it
+        command = [
+            "ffmpeg",
+            "-nostdin",            # never wait for input on the console
+            "-i", input_file,
+            "-c:v", "libx264",    # H.264 video codec
+            "-preset", "fast",     # Encoding speed preset
+            "-crf", "23",          # Constant Rate Factor (quality)
+            "-c:a", "aac",        # AAC audio codec (ignored if no audio stream)
+            "-b:a", "128k",        # Audio bitrate (ignored if no audio stream)
+            "-map", "0:v:0",       # Map first video stream
+            "-map", "0:a?",        # Map audio if present (? makes it optional)
+            str(output_path)
+        ]
+        return command, output_path
@@ -0,0 +1,78 @@
+"""Module for adaptive scheduling of service cycles."""
+
+import asyncio
+import os
+import random
+
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "1"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "30"))
+POLL_BACKOFF_FACTOR = float(os.getenv("POLL_BACKOFF_FACTOR", "2"))
+# wait between cycles while the service is not started
+POLL_IDLE_INTERVAL = float(os.getenv("POLL_IDLE_INTERVAL", "5"))
+
+
+class PollScheduler:
+    """Class representing the cadence of service cycles.
+
+    Cycles run back-to-back while more work is pending, and POLL_MIN_INTERVAL
+    apart while work is found. Idle cycles and backend errors back off
+    exponentially, with jitter, up to POLL_MAX_INTERVAL.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, factor: float) -> None:
+        """Initialize scheduler in burst mode, so the first cycles run quickly."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.factor = factor
+        self.mode = "burst"
+        self.idle_cycles = 0
+        self.error_cycles = 0
+        self.interval = 0.0
+
+    def record_cycle(self, work_found: int, more_pending: bool) -> float:
+        """Record result of a cycle, return delay before next cycle in seconds."""
+        self.error_cycles = 0
+        if more_pending:
+            self.mode = "burst"
+            self.idle_cycles = 0
+            self.interval = 0.0
+            return self.interval
+        if work_found:
+            self.mode = "active"
+            self.idle_cycles = 0
+        else:
+            self.mode = "idle"
+            self.idle_cycles += 1
+        self.interval = self._backoff(self.idle_cycles)
+        return self._jitter(self.interval)
+
+    def record_error(self) -> float:
+        """Record failed cycle, return delay before next cycle in seconds."""
+        self.mode = "error"
+        self.error_cycles += 1
+        self.interval = self._backoff(self.error_cycles)
+        return self._jitter(self.interval)
+
+    async def sleep_after_error(self) -> None:
+        """Record failed cycle and wait before the next one."""
+        await asyncio.sleep(self.record_error())
+
+    def stats(self) -> dict:
+        """Get current cadence."""
+        return {
+            "mode": self.mode,
+            "interval": round(self.interval, 2),
+            "idle_cycles": self.idle_cycles,
+            "error_cycles": self.error_cycles,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+        }
+
+    def _backoff(self, count: int) -> float:
+        """Get interval after count idle or failed cycles in a row."""
+        exponent = min(max(count - 1, 0), 32)
+        return min(self.min_interval * self.factor**exponent, self.max_interval)
+
+    def _jitter(self, interval: float) -> float:
+        """Spread interval randomly between half and full length."""
+        return interval / 2 + random.uniform(0, interval / 2)  # noqa: S311
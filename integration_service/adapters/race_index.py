@@ -0,0 +1,131 @@
+"""Module for in-memory race timetable index."""
+
+import asyncio
+import bisect
+import logging
+import os
+import time
+
+from .config_adapter import ConfigAdapter
+from .raceplans_adapter import RaceplansAdapter
+from .time_parser import TimeParser, get_time_parser
+
+RACE_INDEX_TTL = float(os.getenv("RACE_INDEX_TTL", "60"))
+
+
+class RaceIndex:
+    """Class representing the race timetable of one event, sorted by start time."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.date_patterns = ""
+        self.time_parser: TimeParser = get_time_parser("")
+        self.loaded_at: float | None = None
+        self.races: dict[str, dict] = {}
+        self.start_times: list[float] = []
+        self.race_ids: list[str] = []
+        self._start_epochs: dict[str, float] = {}
+        self._start_time_strings: dict[str, str] = {}
+
+    def update(self, races: list, date_patterns: str) -> int:
+        """Apply raceplan to index, only parse new or changed start times.
+
+        Returns:
+            Number of races added, changed or removed
+
+        """
+        if date_patterns != self.date_patterns:
+            # patterns changed - all start times must be parsed again
+            self._start_epochs.clear()
+            self._start_time_strings.clear()
+            self.date_patterns = date_patterns
+            self.time_parser = get_time_parser(date_patterns)
+
+        changes = 0
+        races_by_id = {}
+        for race in races:
+            race_id = race["id"]
+            races_by_id[race_id] = race
+            if self._start_time_strings.get(race_id) == race["start_time"]:
+                continue
+            self._start_time_strings[race_id] = race["start_time"]
+            epoch = self.time_parser.parse_epoch(race["start_time"])
+            if epoch is None:
+                logging.warning(f"Race {race_id} - unknown start_time format {race['start_time']}")
+                self._start_epochs.pop(race_id, None)
+            else:
+                self._start_epochs[race_id] = epoch
+            changes += 1
+
+        for race_id in set(self.races) - set(races_by_id):
+            self._start_epochs.pop(race_id, None)
+            self._start_time_strings.pop(race_id, None)
+            changes += 1
+
+        self.races = races_by_id
+        if changes:
+            ordered = sorted(
+                (epoch, race_id) for race_id, epoch in self._start_epochs.items()
+            )
+            self.start_times = [epoch for epoch, _ in ordered]
+            self.race_ids = [race_id for _, race_id in ordered]
+        self.loaded_at = time.monotonic()
+        return changes
+
+    def is_stale(self, max_age: float) -> bool:
+        """Check if index is older than max_age seconds."""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def start_epoch(self, race_id: str) -> float | None:
+        """Get parsed start time for race, None if unknown."""
+        return self._start_epochs.get(race_id)
+
+    def parse_epoch(self, timez: str) -> float | None:
+        """Parse time string with the date patterns of the index."""
+        return self.time_parser.parse_epoch(timez)
+
+    def find_best_fit(self, photo_epoch: float, raceduration: int) -> tuple[dict, int] | None:
+        """Find race with start time closest to photo time minus race duration.
+
+        Returns:
+            Tuple with best matching race and the absolute diff in seconds, None if index is empty
+
+        """
+        if not self.start_times:
+            return None
+        target = photo_epoch - raceduration
+        i = bisect.bisect_left(self.start_times, target)
+        candidates = [j for j in (i - 1, i) if 0 <= j < len(self.start_times)]
+        best = min(candidates, key=lambda j: abs(self.start_times[j] - target))
+        seconds_diff = int(abs(self.start_times[best] - target))
+        return self.races[self.race_ids[best]], seconds_diff
+
+
+_race_indexes: dict[str, RaceIndex] = {}
+_race_index_locks: dict[str, asyncio.Lock] = {}
+
+
+async def get_race_index(token: str, event_id: str) -> RaceIndex:
+    """Get race index for event, refresh from raceplan if older than TTL.
+
+    Refresh is single-flight per event - concurrent callers wait for the
+    first one and reuse its result.
+    """
+    race_index = _race_indexes.setdefault(event_id, RaceIndex())
+    if not race_index.is_stale(RACE_INDEX_TTL):
+        return race_index
+    async with _race_index_locks.setdefault(event_id, asyncio.Lock()):
+        if race_index.is_stale(RACE_INDEX_TTL):
+            races = await RaceplansAdapter().get_all_races(token, event_id)
+            date_patterns = await ConfigAdapter().get_config(token, event_id, "DATE_PATTERNS")
+            changes = race_index.update(races, date_patterns)
+            if changes:
+                logging.debug(f"Race index for event {event_id} updated, {changes} changes.")
+    return race_index
+
+
+def invalidate_race_index(event_id: str = "") -> None:
+    """Force refresh of race index for one event, or for all events, on next use."""
+    for key, race_index in _race_indexes.items():
+        if key == event_id or not event_id:
+            race_index.loaded_at = None
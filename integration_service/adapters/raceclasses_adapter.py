@@ -5,9 +5,11 @@ import os
 import urllib.parse
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
+
 EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER", "localhost")
 EVENTS_HOST_PORT = os.getenv("EVENTS_HOST_PORT", "8082")
 EVENT_SERVICE_URL = f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}"
@@ -29,7 +31,7 @@ class RaceclassesAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses",
             headers=headers,
             json=request_body,
@@ -56,7 +58,7 @@ class RaceclassesAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
 
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses",
             headers=headers,
         ) as resp:
@@ -84,7 +86,7 @@ class RaceclassesAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
 
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses/{raceclass_id}",
             headers=headers,
         ) as resp:
@@ -112,7 +114,7 @@ class RaceclassesAdapter:
             ]
         )
         raceclass = {}
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses/{raceclass_id}",
             headers=headers,
         ) as resp:
@@ -148,7 +150,7 @@ class RaceclassesAdapter:
         )
         raceclass = {}
         ageclass_url = urllib.parse.quote(ageclass, safe="")
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses?ageclass-name={ageclass_url}",
             headers=headers,
         ) as resp:
@@ -173,7 +175,7 @@ class RaceclassesAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses", headers=headers
         ) as resp:
             logging.debug(f"get_raceclasses - got response {resp.status}")
@@ -207,7 +209,7 @@ class RaceclassesAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{EVENT_SERVICE_URL}/events/{event_id}/raceclasses/{my_id}",
             headers=headers,
             json=new_data,
@@ -5,9 +5,11 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
+
 RACE_HOST_SERVER = os.getenv("RACE_HOST_SERVER", "localhost")
 RACE_HOST_PORT = os.getenv("RACE_HOST_PORT", "8088")
 RACE_SERVICE_URL = f"http://{RACE_HOST_SERVER}:{RACE_HOST_PORT}"
@@ -22,7 +24,7 @@ class RaceplansAdapter:
         headers = {
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{RACE_SERVICE_URL}/races/{race_id}",
             headers=headers,
         ) as resp:
@@ -51,7 +53,7 @@ class RaceplansAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
         logging.info(f"delete raceplans, id: {raceplan['id']}")
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{RACE_SERVICE_URL}/raceplans/{raceplan['id']}",
             headers=headers,
         ) as resp:
@@ -80,7 +82,7 @@ class RaceplansAdapter:
         )
         request_body = {"event_id": event_id}
         url = f"{RACE_SERVICE_URL}/raceplans/generate-raceplan-for-event"
-        async with ClientSession() as session, session.post(url, headers=headers, json=request_body) as resp:
+        async with get_session().post(url, headers=headers, json=request_body) as resp:
             res = resp.status
             logging.debug(f"generate_raceplan result - got response {resp}")
             if res == HTTPStatus.CREATED:
@@ -104,7 +106,7 @@ class RaceplansAdapter:
             ]
         )
         raceplans = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/raceplans?eventId={event_id}", headers=headers
         ) as resp:
             logging.debug(f"get_all_raceplans - got response {resp.status}")
@@ -131,7 +133,7 @@ class RaceplansAdapter:
             ]
         )
         races = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/races?eventId={event_id}", headers=headers
         ) as resp:
             logging.debug(f"get_all_races - got response {resp.status}")
@@ -164,7 +166,7 @@ class RaceplansAdapter:
             ]
         )
         race = {}
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/races/{race_id}", headers=headers
         ) as resp:
             logging.debug(f"get_race_by_id - got response {resp.status}")
@@ -217,7 +219,7 @@ class RaceplansAdapter:
             ]
         )
         races = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/races?eventId={event_id}&raceclass={valgt_klasse}",
             headers=headers,
         ) as resp:
@@ -263,7 +265,7 @@ class RaceplansAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{RACE_SERVICE_URL}/raceplans/{my_id}",
             headers=headers,
             json=new_data,
@@ -293,7 +295,7 @@ class RaceplansAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{RACE_SERVICE_URL}/races/{my_id}",
             headers=headers,
             json=new_data,
@@ -331,7 +333,7 @@ class RaceplansAdapter:
         }
         logging.info(f"New data - update time: {new_data}")
 
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{RACE_SERVICE_URL}/raceplans/update-start-time/{event_id}",
             headers=headers,
             json=new_data,
@@ -396,7 +398,7 @@ class RaceplansAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ]
         )
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{RACE_SERVICE_URL}/raceplans/{raceplan_id}/validate",
             headers=headers,
         ) as resp:
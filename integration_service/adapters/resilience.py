@@ -0,0 +1,155 @@
+"""Module for retries and circuit breakers on backend requests."""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from http import HTTPStatus
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientHandlerType,
+    ClientRequest,
+    ClientResponse,
+    hdrs,
+)
+
+from .exceptions import BackendUnavailableError
+
+HTTP_RETRY_ATTEMPTS = int(os.getenv("HTTP_RETRY_ATTEMPTS", "3"))
+HTTP_RETRY_BASE_DELAY = float(os.getenv("HTTP_RETRY_BASE_DELAY", "0.5"))
+HTTP_RETRY_MAX_DELAY = float(os.getenv("HTTP_RETRY_MAX_DELAY", "5"))
+# time to wait for response headers, per attempt
+HTTP_ATTEMPT_TIMEOUT = float(os.getenv("HTTP_ATTEMPT_TIMEOUT", "15"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+IDEMPOTENT_METHODS = {hdrs.METH_GET, hdrs.METH_HEAD, hdrs.METH_OPTIONS, hdrs.METH_PUT, hdrs.METH_DELETE}
+RETRY_STATUSES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+class CircuitBreaker:
+    """Class representing the circuit breaker of one backend service.
+
+    After CIRCUIT_FAILURE_THRESHOLD failures in a row the circuit opens and
+    requests fail at once. After CIRCUIT_RESET_TIMEOUT seconds one probe
+    request is let through (half open), its result closes or opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize closed circuit."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.changed_at = time.monotonic()
+
+    def allow_request(self) -> bool:
+        """Check if a request may be sent, start probing when the open timeout has passed."""
+        if self.state == "closed":
+            return True
+        if time.monotonic() - self.changed_at < self.reset_timeout:
+            return False
+        # half open - one probe per reset_timeout, also if a probe never reported back
+        self._set_state("half_open")
+        return True
+
+    def record_success(self) -> None:
+        """Close circuit after a successful request."""
+        self.failures = 0
+        if self.state != "closed":
+            self._set_state("closed")
+
+    def record_failure(self) -> None:
+        """Count failure, open circuit at threshold or when the probe failed."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self._set_state("open")
+
+    def _set_state(self, state: str) -> None:
+        """Change state and log transitions."""
+        if state != self.state:
+            logging.warning(f"Circuit for {self.name} is {state}.")
+        self.state = state
+        self.changed_at = time.monotonic()
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get circuit breaker for backend service, identified by host and port."""
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        breaker = _circuit_breakers[name] = CircuitBreaker(
+            name, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+        )
+    return breaker
+
+
+def get_circuit_states() -> dict[str, str]:
+    """Get state of all circuit breakers."""
+    return {name: breaker.state for name, breaker in _circuit_breakers.items()}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check if error is a temporary backend failure that should not stop the service."""
+    return isinstance(error, BackendUnavailableError | TimeoutError)
+
+
+def get_retry_delay(attempt: int, response: ClientResponse | None = None) -> float:
+    """Get jittered exponential backoff, honour numeric Retry-After up to max delay."""
+    delay = min(HTTP_RETRY_BASE_DELAY * 2 ** (attempt - 1), HTTP_RETRY_MAX_DELAY)
+    if response is not None:
+        retry_after = response.headers.get(hdrs.RETRY_AFTER, "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HTTP_RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+
+async def resilience_middleware(
+    request: ClientRequest, handler: ClientHandlerType
+) -> ClientResponse:
+    """Send request with per attempt timeout, retries and circuit breaker.
+
+    Idempotent methods are retried on connection errors, timeouts and
+    429/502/503/504 responses. Raises BackendUnavailableError when the circuit
+    is open or all attempts failed.
+    """
+    service = f"{request.url.host}:{request.url.port}"
+    breaker = get_circuit_breaker(service)
+    attempts = HTTP_RETRY_ATTEMPTS if request.method in IDEMPOTENT_METHODS else 1
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow_request():
+            informasjon = f"{service} unavailable (circuit open) - {request.method} {request.url.path}"
+            raise BackendUnavailableError(informasjon)
+        try:
+            response = await asyncio.wait_for(handler(request), HTTP_ATTEMPT_TIMEOUT)
+        except (ClientConnectionError, TimeoutError) as e:
+            breaker.record_failure()
+            informasjon = f"{request.method} {request.url.path} to {service} failed: {e!r}"
+            if attempt == attempts:
+                raise BackendUnavailableError(informasjon) from e
+            logging.warning(f"{informasjon} - retry {attempt}")
+            delay = get_retry_delay(attempt)
+        else:
+            if response.status not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            response.release()
+            informasjon = f"{request.method} {request.url.path} to {service} failed: {response.status}"
+            if attempt == attempts:
+                raise BackendUnavailableError(informasjon)
+            logging.warning(f"{informasjon} - retry {attempt}")
+            delay = get_retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+    informasjon = f"{request.method} {request.url.path} to {service} - no attempts made"
+    raise BackendUnavailableError(informasjon)
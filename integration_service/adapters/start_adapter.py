@@ -4,9 +4,11 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .http_client import get_session
+
 RACE_HOST_SERVER = os.getenv("RACE_HOST_SERVER", "localhost")
 RACE_HOST_PORT = os.getenv("RACE_HOST_PORT", "8088")
 RACE_SERVICE_URL = f"http://{RACE_HOST_SERVER}:{RACE_HOST_PORT}"
@@ -25,7 +27,7 @@ class StartAdapter:
             ]
         )
         request_body = {"event_id": event_id}
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{RACE_SERVICE_URL}/startlists/generate-startlist-for-event",
             headers=headers,
             json=request_body,
@@ -57,7 +59,7 @@ class StartAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
 
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{RACE_SERVICE_URL}/races/{race_id}/start-entries/{start_entry_id}",
             headers=headers,
         ) as resp:
@@ -82,7 +84,7 @@ class StartAdapter:
         headers = {
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             f"{RACE_SERVICE_URL}/startlists/{start_list_id}",
             headers=headers,
         ) as resp:
@@ -111,7 +113,7 @@ class StartAdapter:
             ]
         )
         start_entries = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/races/{race_id}/start-entries",
             headers=headers,
         ) as resp:
@@ -145,7 +147,7 @@ class StartAdapter:
             ]
         )
         start_entry = {}
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/races/{race_id}/start-entries/{start_id}",
             headers=headers,
         ) as resp:
@@ -177,7 +179,7 @@ class StartAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/startlists?eventId={event_id}&bib={bib}",
             headers=headers,
         ) as resp:
@@ -204,7 +206,7 @@ class StartAdapter:
             ]
         )
         starts = []
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{RACE_SERVICE_URL}/startlists?eventId={event_id}", headers=headers
         ) as resp:
             logging.debug(f"get_all_starts_by_event - got response {resp.status}")
@@ -227,7 +229,7 @@ class StartAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
         logging.debug(f"New start: {new_start}")
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{RACE_SERVICE_URL}/races/{new_start['race_id']}/start-entries",
             headers=headers,
             json=new_start,
@@ -256,7 +258,7 @@ class StartAdapter:
             hdrs.AUTHORIZATION: f"Bearer {token}",
         }
         logging.debug(f"New start: {new_start}")
-        async with ClientSession() as session, session.put(
+        async with get_session().put(
             f"{RACE_SERVICE_URL}/races/{new_start['race_id']}/start-entries/{s_id}",
             headers=headers,
             json=new_start,
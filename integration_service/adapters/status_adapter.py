@@ -1,15 +1,15 @@
 """Module for status adapter."""
 
-import copy
 import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from dotenv import load_dotenv
 from multidict import MultiDict
 
 from .events_adapter import EventsAdapter
+from .http_client import get_session
 
 # get base settings
 load_dotenv()
@@ -33,7 +33,7 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event_id}",
             headers=headers,
         ) as resp:
@@ -62,7 +62,7 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
+        async with get_session().get(
             f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event['id']}&type={status_type}",
             headers=headers,
         ) as resp:
@@ -98,10 +98,10 @@ class StatusAdapter:
             "message": message,
             "details": details,
         }
-        request_body = copy.deepcopy(status_dict)
 
-        async with ClientSession() as session, session.post(
-            f"{PHOTO_SERVICE_URL}/status", headers=headers, json=request_body
+        # body is serialized when the request is sent - no copy needed
+        async with get_session().post(
+            f"{PHOTO_SERVICE_URL}/status", headers=headers, json=status_dict
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
                 logging.debug(f"result - got response {resp}")
@@ -129,7 +129,7 @@ class StatusAdapter:
             ]
         )
         url = f"{PHOTO_SERVICE_URL}/status?eventId={event['id']}"
-        async with ClientSession() as session, session.delete(
+        async with get_session().delete(
             url, headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.NO_CONTENT:
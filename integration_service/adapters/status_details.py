@@ -0,0 +1,87 @@
+"""Module for compact status details."""
+
+import hashlib
+import os
+from collections import Counter
+
+# set STATUS_VERBOSE=true to ship complete item lists in status details
+STATUS_VERBOSE = os.getenv("STATUS_VERBOSE", "False").lower() == "true"
+STATUS_MAX_ERRORS = int(os.getenv("STATUS_MAX_ERRORS", "10"))
+
+
+def item_name(item: dict | str) -> str:
+    """Get name of a status detail item - blob, file or job."""
+    if isinstance(item, dict):
+        return str(item.get("name") or item.get("url", ""))
+    return str(item)
+
+
+def summarize_items(items: list) -> list | dict:
+    """Summarize list of items for status details, unchanged in verbose mode.
+
+    Returns:
+        Count, first and last name, hash of all names and the first failed items
+
+    """
+    if STATUS_VERBOSE:
+        return items
+    return build_summary(items)
+
+
+def summarize_uploads(uploads: list[dict]) -> list | dict:
+    """Summarize upload stats, with totals and throughput of the completed uploads.
+
+    Resumed uploads only archived the file, they are counted but not included
+    in the throughput.
+    """
+    if STATUS_VERBOSE:
+        return uploads
+    summary = build_summary(uploads)
+    completed = [
+        upload for upload in uploads if "exception" not in upload and not upload.get("resumed")
+    ]
+    total_bytes = sum(upload["bytes"] for upload in completed)
+    total_seconds = sum(upload["seconds"] for upload in completed)
+    summary.update({
+        "resumed": sum(1 for upload in uploads if upload.get("resumed")),
+        "total_bytes": total_bytes,
+        "total_seconds": round(total_seconds, 3),
+        "mean_mbit_per_s": round(total_bytes * 8 / 1_000_000 / max(total_seconds, 0.001), 2)
+        if completed
+        else 0,
+        "min_mbit_per_s": min((upload["mbit_per_s"] for upload in completed), default=0),
+    })
+    return summary
+
+
+def summarize_transcode_jobs(jobs: list[dict]) -> list | dict:
+    """Summarize transcode job stats, with number of jobs per conversion path and codec."""
+    if STATUS_VERBOSE:
+        return jobs
+    summary = build_summary(jobs)
+    completed = [job for job in jobs if "exception" not in job]
+    summary.update({
+        "paths": dict(Counter(job["path"] for job in completed)),
+        "codecs": dict(Counter(job["codec"] or "unknown" for job in completed)),
+        "total_seconds": round(sum(job["seconds"] for job in completed), 3),
+    })
+    return summary
+
+
+def build_summary(items: list) -> dict:
+    """Get count, first and last name, hash of all names and the first failed items."""
+    names = [item_name(item) for item in items]
+    summary = {
+        "count": len(items),
+        "first": names[0] if names else "",
+        "last": names[-1] if names else "",
+        "hash": hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()[:16],
+    }
+    errors = [
+        {"name": item_name(item), "exception": item["exception"]}
+        for item in items
+        if isinstance(item, dict) and "exception" in item
+    ]
+    if errors:
+        summary["errors"] = errors[:STATUS_MAX_ERRORS]
+    return summary
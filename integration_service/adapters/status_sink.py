@@ -0,0 +1,159 @@
+"""Module for background writing of status messages."""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections import Counter
+
+from .status_adapter import StatusAdapter
+
+STATUS_QUEUE_SIZE = int(os.getenv("STATUS_QUEUE_SIZE", "100"))
+STATUS_BATCH_SIZE = int(os.getenv("STATUS_BATCH_SIZE", "10"))
+STATUS_FLUSH_INTERVAL = float(os.getenv("STATUS_FLUSH_INTERVAL", "2"))
+STATUS_STOP_TIMEOUT = float(os.getenv("STATUS_STOP_TIMEOUT", "10"))
+
+# message priorities - low priority messages are dropped first under overload
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+
+class StatusSink:
+    """Class representing a bounded queue of status messages, written in the background.
+
+    Messages with the same event, type and text that are waiting in the queue
+    are coalesced into one, with the latest details and a repeat count. The
+    queue is flushed in batches every STATUS_FLUSH_INTERVAL seconds, or at once
+    when it is half full. When the queue is full, the oldest message with lower
+    priority is dropped to make room, otherwise the new message is dropped.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float) -> None:
+        """Initialize empty queue, call start() from the running event loop."""
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counts: Counter = Counter()
+        self._queue: dict[tuple, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def submit(
+        self,
+        token: str,
+        event: dict,
+        status_type: str,
+        message: str,
+        details: dict,
+        *,
+        priority: int = PRIORITY_NORMAL,
+    ) -> bool:
+        """Queue status message without waiting for the status backend.
+
+        Returns:
+            True if message was queued or coalesced, False if it was dropped
+
+        """
+        key = (event["id"], status_type, message)
+        queued = self._queue.get(key)
+        if queued:
+            queued["token"] = token
+            queued["details"] = dict(details)
+            queued["repeat_count"] += 1
+            queued["priority"] = max(queued["priority"], priority)
+            self.counts["coalesced"] += 1
+            return True
+        if len(self._queue) >= self.max_size and not self._make_room(priority):
+            self.counts["dropped"] += 1
+            logging.info(f"Status queue full, dropped: {message}")
+            return False
+        self._queue[key] = {
+            "token": token,
+            "event": event,
+            "status_type": status_type,
+            "message": message,
+            "details": dict(details),
+            "priority": priority,
+            "repeat_count": 1,
+        }
+        self.counts["queued"] += 1
+        if len(self._queue) >= self.max_size // 2:
+            self._wakeup.set()
+        return True
+
+    def _make_room(self, priority: int) -> bool:
+        """Drop oldest queued message with lower priority, return False if there is none."""
+        for key, queued in self._queue.items():
+            if queued["priority"] < priority:
+                del self._queue[key]
+                self.counts["dropped"] += 1
+                logging.info(f"Status queue full, dropped: {queued['message']}")
+                return True
+        return False
+
+    def stats(self) -> dict:
+        """Get queue length and counters."""
+        return {"queue_length": len(self._queue), **self.counts}
+
+    def start(self) -> None:
+        """Start background flushing."""
+        if self._task is None:
+            self._stopping = False
+            # new event for the running loop, the sink may be restarted in another loop
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background flushing, remaining messages are written first."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, STATUS_STOP_TIMEOUT)
+        except TimeoutError:
+            logging.warning(f"Status queue not flushed, {len(self._queue)} messages lost.")
+        self._task = None
+
+    async def _run(self) -> None:
+        """Flush queue on timer, or when woken up by a filling queue or stop."""
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            while self._queue:
+                await self.flush()
+        while self._queue:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write one batch of queued messages, highest priority first."""
+        keys = sorted(self._queue, key=lambda key: -self._queue[key]["priority"])
+        batch = [self._queue.pop(key) for key in keys[: self.batch_size]]
+        results = await asyncio.gather(
+            *(self._write(queued) for queued in batch), return_exceptions=True
+        )
+        for queued, result in zip(batch, results, strict=True):
+            if isinstance(result, BaseException):
+                self.counts["failed"] += 1
+                logging.error(f"Error writing status '{queued['message']}': {result}")
+            else:
+                self.counts["written"] += 1
+
+    async def _write(self, queued: dict) -> str:
+        """Write one status message."""
+        details = queued["details"]
+        if queued["repeat_count"] > 1:
+            details = {**details, "repeat_count": queued["repeat_count"]}
+        return await StatusAdapter().create_status(
+            queued["token"],
+            queued["event"],
+            queued["status_type"],
+            queued["message"],
+            details,
+        )
+
+
+status_sink = StatusSink(STATUS_QUEUE_SIZE, STATUS_BATCH_SIZE, STATUS_FLUSH_INTERVAL)
@@ -1,8 +1,10 @@
 """Module for sync service."""
 
-import datetime
+import asyncio
 import json
 import logging
+import os
+import time
 from collections import Counter
 from http import HTTPStatus
 from pathlib import Path
@@ -10,23 +12,51 @@ from pathlib import Path
 import piexif
 
 from .ai_image_service import AiImageService
+from .ai_result_cache import ai_result_cache
+from .bib_index import find_start_entries_by_bib, get_bib_index
+from .capture_watcher import get_capture_watcher
 from .config_adapter import ConfigAdapter
-from .contestants_adapter import ContestantsAdapter
 from .google_cloud_storage_adapter import GoogleCloudStorageAdapter
 from .google_pub_sub_adapter import GooglePubSubAdapter
 from .photos_adapter import PhotosAdapter
 from .photos_file_adapter import PhotosFileAdapter
+from .race_index import get_race_index
 from .raceclasses_adapter import RaceclassesAdapter
-from .raceplans_adapter import RaceplansAdapter
-from .start_adapter import StartAdapter
-from .status_adapter import StatusAdapter
+from .resilience import is_transient_error
+from .status_details import summarize_items, summarize_transcode_jobs, summarize_uploads
+from .status_sink import PRIORITY_HIGH, status_sink
+from .time_parser import get_time_parser
+from .transcode_service import TranscodeService
+from .work_journal import CAPTURE, DETECTION, work_journal
 
 BIG_DIFF = 99999
+# max number of detections in flight per pipeline stage
+PIPELINE_CONCURRENCY = {
+    "lookup": int(os.getenv("PIPELINE_LOOKUP_CONCURRENCY", "10")),
+    "analyze": int(os.getenv("PIPELINE_ANALYZE_CONCURRENCY", "4")),
+    "link": int(os.getenv("PIPELINE_LINK_CONCURRENCY", "10")),
+    "persist": int(os.getenv("PIPELINE_PERSIST_CONCURRENCY", "5")),
+    "archive": int(os.getenv("PIPELINE_ARCHIVE_CONCURRENCY", "5")),
+}
+DETECT_PAGE_SIZE = int(os.getenv("DETECT_PAGE_SIZE", "25"))
+DETECT_DRAIN_MAX_PAGES = int(os.getenv("DETECT_DRAIN_MAX_PAGES", "20"))
+# failed attempts before a detection is moved to DETECT_ERROR
+DETECT_MAX_FAILURES = int(os.getenv("DETECT_MAX_FAILURES", "3"))
+CAPTURE_UPLOAD_CONCURRENCY = int(os.getenv("CAPTURE_UPLOAD_CONCURRENCY", "3"))
 
 
 class SyncService:
     """Class representing sync service."""
 
+    def __init__(self) -> None:
+        """Initialize drain state of the DETECT prefix and journal recovery state."""
+        # detections left in DETECT after last drain, and if more pages may be waiting
+        self.detect_backlog = 0
+        self.drain_pending = False
+        # items found in last cycle, used to schedule the next cycle
+        self.work_found = 0
+        self.journal_recovered = False
+
     async def create_new_photo_from_detection(
         self, token: str, event: dict, detection: dict
     ) -> dict:
@@ -63,9 +93,14 @@ class SyncService:
         # analyze photo with Vision AI
         try:
             conf_limit = await ConfigAdapter().get_config(token, event["id"], "CONFIDENCE_LIMIT")
-            photo_info["ai_information"] = AiImageService().analyze_photo_g_langrenn_v2(
-                detection["url"], detection["crop_url"], conf_limit
-            )
+            cache_key = ai_result_cache.make_key(detection, conf_limit)
+            ai_information = ai_result_cache.get(cache_key)
+            if ai_information is None:
+                ai_information = await AiImageService().analyze_photo_g_langrenn_v2_async(
+                    detection["url"], detection["crop_url"], conf_limit
+                )
+                ai_result_cache.put(cache_key, ai_information)
+            photo_info["ai_information"] = ai_information
         except Exception as e:
             error_text = f"AiImageService - Error analysing photos {detection['url']}"
             logging.exception(error_text)
@@ -82,171 +117,515 @@ class SyncService:
 
         return photo_info
 
-    async def pull_photos_from_pubsub(
+    async def update_photo_from_detection(self, token: str, photo: dict, detection: dict) -> None:
+        """Update existing photo with info from detection."""
+        photo["name"] = Path(detection["url"]).name
+        photo["g_crop_url"] = ""
+        photo["g_base_url"] = detection["url"]
+        if detection["metadata"]["passeringspunkt"] in [
+            "Finish",
+            "Mål",
+        ]:
+            photo["is_photo_finish"] = True
+        if detection["metadata"]["passeringspunkt"] == "Start":
+            photo["is_start_registration"] = True
+        result = await PhotosAdapter().update_photo(
+            token, photo["id"], photo
+        )
+        logging.debug(
+            f"Updated photo with id {photo['id']}, result {result}"
+        )
+
+    async def process_detection(
         self,
         token: str,
         event: dict,
-    ) -> str:
-        """Get new detections from cloud storage and sync with local database."""
-        informasjon = ""
-        status_type = await ConfigAdapter().get_config(
-            token, event["id"], "INTEGRATION_SERVICE_STATUS_TYPE"
-        )
-        i_c = 0
-        i_u = 0
+        detection: dict,
+        raceclasses: list,
+        *,
+        stage_limits: dict[str, asyncio.Semaphore],
+        stage_counts: Counter,
+    ) -> dict:
+        """Run one detection through the pipeline stages.
 
-        detect_list = GoogleCloudStorageAdapter().list_detect_blobs(event["id"], 10)
-        if len(detect_list) == 0:
-            informasjon = "Ingen bilder funnet."
-        else:
-            raceclasses = await RaceclassesAdapter().get_raceclasses(
-                token, event["id"]
-            )
-            new_photos = []
-            for detection in detect_list:
-                # update or create record in db
+        Each stage is limited by its own semaphore. Errors are logged and
+        counted per stage, they do not stop processing of other detections.
+        Detections with a photo recorded in the work journal go straight to
+        the archive stage. A detection that fails DETECT_MAX_FAILURES times,
+        not counting transient errors, is moved to DETECT_ERROR.
+
+        Returns:
+            Created photo info, empty dict if photo was updated, resumed or failed
+
+        """
+        stage = "lookup"
+        try:
+            journal_entry = work_journal.get(DETECTION, detection["url"])
+            if journal_entry and journal_entry["stage"] == "created":
+                # photo created before a crash or failed archive move
+                stage = "archive"
+                await self.archive_detection(
+                    event, detection, journal_entry["data"]["g_base_url"], stage_limits
+                )
+                stage_counts["resumed"] += 1
+                return {}
+
+            async with stage_limits["lookup"]:
                 try:
                     photo = await PhotosAdapter().get_photo_by_g_base_url(
                         token, detection["url"]
                     )
                 except Exception:
                     photo = {}
+            stage_counts["lookup"] += 1
+
+            if photo:
+                stage = "persist"
+                async with stage_limits["persist"]:
+                    await self.update_photo_from_detection(token, photo, detection)
+                stage_counts["updated"] += 1
+                return {}
+
+            stage = "analyze"
+            async with stage_limits["analyze"]:
+                photo_info = await self.create_new_photo_from_detection(
+                    token, event, detection
+                )
+            stage_counts["analyze"] += 1
 
-                if photo:
-                    # update existing photo
-                    photo["name"] = Path(detection["url"]).name
-                    photo["g_crop_url"] = ""
-                    photo["g_base_url"] = detection["url"]
-                    if detection["metadata"]["passeringspunkt"] in [
-                        "Finish",
-                        "Mål",
-                    ]:
-                        photo["is_photo_finish"] = True
-                    if detection["metadata"]["passeringspunkt"] == "Start":
-                        photo["is_start_registration"] = True
-                    result = await PhotosAdapter().update_photo(
-                        token, photo["id"], photo
+            stage = "link"
+            if photo_info["ai_information"]:
+                async with stage_limits["link"]:
+                    await link_ai_info_to_photo_by_bib(
+                        token,
+                        photo_info,
+                        event,
+                        raceclasses,
                     )
-                    logging.debug(
-                        f"Updated photo with id {photo['id']}, result {result}"
+            stage_counts["link"] += 1
+
+            stage = "persist"
+            photo_info["g_base_url"] = photo_info["g_base_url"].replace("/DETECT/", "/DETECT_ARCHIVE/")
+            async with stage_limits["persist"]:
+                photo_id = await PhotosAdapter().create_photo(token, photo_info)
+            logging.debug(f"Created photo with id {photo_id}")
+            work_journal.record(
+                DETECTION,
+                detection["url"],
+                "created",
+                {"photo_id": photo_id, "event_id": event["id"], "g_base_url": photo_info["g_base_url"]},
+            )
+            stage_counts["persist"] += 1
+            stage_counts["created"] += 1
+
+            # move processed blob to archive
+            stage = "archive"
+            await self.archive_detection(event, detection, photo_info["g_base_url"], stage_limits)
+            stage_counts["archive"] += 1
+        except Exception as e:
+            logging.exception(f"Error in {stage} stage for detection {detection['url']}")
+            stage_counts[f"{stage}_errors"] += 1
+            stage_counts["failed"] += 1
+            await self.record_detection_failure(event, detection, stage, stage_counts, error=e)
+            return {}
+        return photo_info
+
+    async def record_detection_failure(
+        self, event: dict, detection: dict, stage: str, stage_counts: Counter, *, error: Exception
+    ) -> None:
+        """Count failed attempt in the work journal, move blob to DETECT_ERROR at the limit.
+
+        Transient errors (unavailable backends, timeouts) are not counted, the
+        detection is retried until the backends are back. A detection with a
+        created photo is never moved to DETECT_ERROR, the photo already points
+        at DETECT_ARCHIVE, so the archive move is retried instead.
+        """
+        journal_entry = work_journal.get(DETECTION, detection["url"])
+        if journal_entry and journal_entry["stage"] == "created":
+            return
+        if is_transient_error(error):
+            stage_counts["transient_errors"] += 1
+            return
+        failures = 1
+        if journal_entry and journal_entry["stage"] == "failed":
+            failures += journal_entry["data"].get("failures", 0)
+        work_journal.record(
+            DETECTION,
+            detection["url"],
+            "failed",
+            {"event_id": event["id"], "failures": failures, "failed_stage": stage},
+        )
+        if failures < DETECT_MAX_FAILURES:
+            return
+        try:
+            await asyncio.to_thread(
+                GoogleCloudStorageAdapter().move_detect_blob,
+                event["id"],
+                Path(detection["url"]).name,
+                "DETECT_ERROR",
+            )
+        except Exception:
+            logging.exception(f"Error moving detection {detection['url']} to DETECT_ERROR")
+            return
+        work_journal.record(DETECTION, detection["url"], "error")
+        stage_counts["moved_to_error"] += 1
+        logging.error(f"Detection {detection['url']} failed {failures} times, moved to DETECT_ERROR")
+
+    async def archive_detection(
+        self,
+        event: dict,
+        detection: dict,
+        g_base_url: str,
+        stage_limits: dict[str, asyncio.Semaphore],
+    ) -> None:
+        """Move processed detection blob to archive and record it in the work journal.
+
+        The move raises on error, so the journal entry stays created until the
+        blob has actually been archived.
+        """
+        async with stage_limits["archive"]:
+            await asyncio.to_thread(
+                GoogleCloudStorageAdapter().move_detect_blob,
+                event["id"],
+                Path(g_base_url).name,
+                "DETECT_ARCHIVE",
+            )
+        work_journal.record(DETECTION, detection["url"], "archived")
+
+    async def recover_from_journal(self, event: dict) -> None:
+        """Finish items interrupted after upload or photo creation, once per service start."""
+        if self.journal_recovered:
+            return
+        self.journal_recovered = True
+        capture_folder = Path(PhotosFileAdapter().get_capture_folder_path())
+        for journal_key, _ in work_journal.pending(CAPTURE, "uploaded"):
+            event_id, _, name = journal_key.partition("/")
+            if event_id == event["id"]:
+                video = {"name": name, "url": str(capture_folder / name)}
+                logging.info(f"Journal recovery - archiving uploaded video {name}")
+                if self.archive_captured_video(event_id, video):
+                    work_journal.record(CAPTURE, journal_key, "archived")
+        for journal_key, data in work_journal.pending(DETECTION, "created"):
+            if data.get("event_id") == event["id"]:
+                logging.info(f"Journal recovery - archiving detection {journal_key}")
+                try:
+                    await asyncio.to_thread(
+                        GoogleCloudStorageAdapter().move_detect_blob,
+                        event["id"],
+                        Path(data["g_base_url"]).name,
+                        "DETECT_ARCHIVE",
                     )
-                    i_u += 1
-                else:
-                    # create new photo
-                    photo_info = await self.create_new_photo_from_detection(
-                        token, event, detection
+                except Exception:
+                    # blob is archived when it is listed in DETECT again
+                    logging.exception(f"Journal recovery - error archiving detection {journal_key}")
+                    continue
+                work_journal.record(DETECTION, journal_key, "archived")
+
+    async def process_detections(
+        self,
+        token: str,
+        event: dict,
+        detect_list: list,
+        raceclasses: list,
+        stage_counts: Counter,
+    ) -> list:
+        """Process detections concurrently, return list of created photos."""
+        stage_limits = {
+            stage: asyncio.Semaphore(limit)
+            for stage, limit in PIPELINE_CONCURRENCY.items()
+        }
+        results = await asyncio.gather(
+            *(
+                self.process_detection(
+                    token,
+                    event,
+                    detection,
+                    raceclasses,
+                    stage_limits=stage_limits,
+                    stage_counts=stage_counts,
+                )
+                for detection in detect_list
+            )
+        )
+        return [photo for photo in results if photo]
+
+    async def pull_photos_from_pubsub(
+        self,
+        token: str,
+        event: dict,
+    ) -> str:
+        """Get new detections from cloud storage and sync with local database.
+
+        The DETECT prefix is drained page by page, following page tokens until
+        it is exhausted or DETECT_DRAIN_MAX_PAGES pages have been processed.
+        drain_pending is set if there may be more detections waiting and the
+        drain made progress. detect_backlog counts the detections left in
+        DETECT, failed ones for retry and those on pages not yet drained. It
+        is also reported in the service heartbeat.
+        """
+        informasjon = ""
+        status_type = await ConfigAdapter().get_config(
+            token, event["id"], "INTEGRATION_SERVICE_STATUS_TYPE"
+        )
+        detect_list = []
+        new_photos = []
+        raceclasses = []
+        stage_counts: Counter = Counter()
+        page_token = ""
+        pages = 0
+        self.drain_pending = False
+        await self.recover_from_journal(event)
+        while True:
+            detect_page, page_token = await asyncio.to_thread(
+                GoogleCloudStorageAdapter().list_detect_blobs_page,
+                event["id"],
+                DETECT_PAGE_SIZE,
+                page_token,
+            )
+            pages += 1
+            if detect_page:
+                if not raceclasses:
+                    raceclasses = await RaceclassesAdapter().get_raceclasses(
+                        token, event["id"]
                     )
-                    new_photos.append(photo_info)
+                new_photos += await self.process_detections(
+                    token, event, detect_page, raceclasses, stage_counts
+                )
+                detect_list += detect_page
+            if not page_token:
+                break
+            if pages >= DETECT_DRAIN_MAX_PAGES:
+                self.drain_pending = True
+                break
+        # failed detections stay in DETECT for retry, unless moved to DETECT_ERROR
+        self.detect_backlog = stage_counts["failed"] - stage_counts["moved_to_error"]
+        if self.drain_pending:
+            # add detections on the pages left for the next drain
+            try:
+                self.detect_backlog += await asyncio.to_thread(
+                    GoogleCloudStorageAdapter().count_detect_blobs, event["id"], page_token
+                )
+            except Exception:
+                logging.exception("Error counting detections left in DETECT")
+        # failed detections stay in DETECT - only progress keeps the cadence up
+        self.work_found = stage_counts["created"] + stage_counts["updated"] + stage_counts["resumed"]
+        self.drain_pending = self.drain_pending and self.work_found > 0
 
+        if len(detect_list) == 0:
+            informasjon = "Ingen bilder funnet."
+        else:
             if new_photos:
-                informasjon += f"Funnet {len(new_photos)} nye bilder. "
-                for photo in new_photos:
-                    if photo["ai_information"]:
-                        result = await link_ai_info_to_photo_by_bib(
-                            token,
-                            photo,
-                            event,
-                            raceclasses,
-                        )
-
-                    photo["g_base_url"] = photo["g_base_url"].replace("/DETECT/", "/DETECT_ARCHIVE/")
-                    photo_id = await PhotosAdapter().create_photo(
-                        token, photo
-                    )
-                    logging.debug(f"Created photo with id {photo_id}")
-                    i_c += 1
-                    # move processed blob to archive
-                    GoogleCloudStorageAdapter().move_to_detect_archive(
-                        event["id"], Path(photo["g_base_url"]).name
-                    )
                 await ConfigAdapter().update_config(
                     token, event["id"], "GOOGLE_LATEST_PHOTO", new_photos[0]["g_base_url"]
                 )
-            informasjon = f"Synkronisert {i_c} bilder fra Google Cloud Storage."
+            informasjon = f"Synkronisert {stage_counts['created']} bilder fra Google Cloud Storage."
+            if stage_counts["failed"]:
+                informasjon += f" {stage_counts['failed']} feilet."
             details = {
                 "service_name": "pull_photos_from_pubsub",
-                "created_photos": i_c,
-                "updated_photos": i_u,
-                "detect_list": detect_list,
+                "created_photos": stage_counts["created"],
+                "updated_photos": stage_counts["updated"],
+                "failed_photos": stage_counts["failed"],
+                "stage_counts": {
+                    stage: count
+                    for stage, count in stage_counts.items()
+                    if stage not in ["created", "updated", "failed"]
+                },
+                "detect_count": len(detect_list),
+                "detect_backlog": self.detect_backlog,
+                "drain_pages": pages,
+                "drain_pending": self.drain_pending,
+                "ai_cache": ai_result_cache.stats(),
+                "work_journal": work_journal.stats(),
+                "detect_list": summarize_items(detect_list),
             }
 
-            await StatusAdapter().create_status(token, event, status_type, informasjon, details)
+            status_sink.submit(token, event, status_type, informasjon, details)
         return informasjon
 
+    async def upload_captured_video(
+        self,
+        token: str,
+        event: dict,
+        status_type: str,
+        video: dict,
+        upload_limit: asyncio.Semaphore,
+    ) -> dict:
+        """Upload one captured video to cloud storage and move it to local archive.
+
+        The blocking upload runs in a worker thread, at most upload_limit at a time.
+
+        Returns:
+            Upload stats for the video, with exception text if the upload failed
+
+        """
+        service_name = "push_captured_video"
+        upload_stats = {"name": video["name"], "bytes": video["size"]}
+        journal_key = f"{event['id']}/{video['name']}"
+        journal_entry = work_journal.get(CAPTURE, journal_key)
+        if (
+            journal_entry
+            and journal_entry["stage"] == "uploaded"
+            and journal_entry["data"].get("bytes") == video["size"]
+        ):
+            # uploaded before a crash or failed archive move - only archive again
+            url_video = journal_entry["data"]["url"]
+            upload_stats["resumed"] = True
+            seconds = 0.0
+        else:
+            try:
+                url_video, seconds = await self.upload_video_blob(
+                    token, event, status_type, video, upload_limit
+                )
+            except Exception as e:
+                upload_stats["exception"] = str(e)
+                return upload_stats
+            work_journal.record(
+                CAPTURE, journal_key, "uploaded", {"url": url_video, "bytes": video["size"]}
+            )
+
+        if self.archive_captured_video(event["id"], video):
+            work_journal.record(CAPTURE, journal_key, "archived")
+        else:
+            error_text = f"{service_name} - Error moving file {video["name"]} to local archive."
+            logging.error(error_text)
+
+        upload_stats["url"] = url_video
+        upload_stats["seconds"] = round(seconds, 3)
+        upload_stats["mbit_per_s"] = round(video["size"] * 8 / 1_000_000 / max(seconds, 0.001), 2)
+        return upload_stats
+
+    def archive_captured_video(self, event_id: str, video: dict) -> bool:
+        """Move uploaded video to local archive, return True if it is no longer in the capture folder."""
+        if not Path(video["url"]).is_file():
+            return True
+        try:
+            PhotosFileAdapter().move_to_capture_archive(event_id, "local_storage", video["name"])
+        except Exception:
+            logging.exception(f"Error archiving captured video {video['name']}")
+        return not Path(video["url"]).is_file()
+
+    async def upload_video_blob(
+        self,
+        token: str,
+        event: dict,
+        status_type: str,
+        video: dict,
+        upload_limit: asyncio.Semaphore,
+    ) -> tuple[str, float]:
+        """Upload video to cloud storage, keep it for resume or move it to error archive on error.
+
+        Returns:
+            Tuple with url of uploaded video and upload time in seconds
+
+        """
+        service_name = "push_captured_video"
+        async with upload_limit:
+            started = time.monotonic()
+            try:
+                url_video = await asyncio.to_thread(
+                    GoogleCloudStorageAdapter().upload_blob, event["id"], "CAPTURE", video["url"]
+                )
+            except Exception as e:
+                informasjon = "Error uploading captured video."
+                details = {
+                    "video_name": video["name"],
+                    "video_url": video["url"],
+                    "service_name": service_name,
+                    "exception": str(e)
+                }
+                status_sink.submit(
+                    token,
+                    event,
+                    status_type,
+                    informasjon,
+                    details,
+                    priority=PRIORITY_HIGH,
+                )
+                logging.exception(informasjon)
+                if GoogleCloudStorageAdapter().has_pending_upload(event["id"], "CAPTURE", video["url"]):
+                    # keep file, upload continues from last committed byte next cycle
+                    logging.info(f"{service_name} - Upload of {video['name']} will be resumed.")
+                    get_capture_watcher().queue_file(
+                        PhotosFileAdapter().get_capture_folder_path(), video["name"]
+                    )
+                else:
+                    PhotosFileAdapter().move_to_error_archive(
+                        event["id"],
+                        "local_storage",
+                        video["name"],
+                    )
+                raise
+        return url_video, time.monotonic() - started
 
     async def process_captured_raw_videos(self, token: str, event: dict, storage_mode: str) -> str:
         """Process captured raw videos and push to cloud storage if needed."""
         i_video_count = 0
         i_raw_video_count = 0
         i_error_count = 0
-        informasjon = ""
-        details = {}
         service_name = "push_captured_video"
         status_type = await ConfigAdapter().get_config(
             token, event["id"], "INTEGRATION_SERVICE_STATUS_TYPE"
         )
 
-        # loop raw videos and convert/repair
-        raw_videos = PhotosFileAdapter().get_all_raw_capture_files(event["id"], "local_storage")
-        for raw_video in raw_videos:
-            PhotosFileAdapter().convert_raw_to_mp4(raw_video["url"])
-            i_raw_video_count += 1
+        await self.recover_from_journal(event)
 
-        # loop videos and upload to cloud storage
+        # convert/repair raw videos queued by the folder watcher
+        watcher = get_capture_watcher()
+        raw_videos = watcher.take_ready(PhotosFileAdapter().get_raw_capture_folder_path())
+        self.work_found = len(raw_videos)
+        transcode_jobs = await TranscodeService().convert_all(raw_videos)
+        for job in transcode_jobs:
+            if "exception" in job:
+                i_error_count += 1
+            else:
+                i_raw_video_count += 1
+        informasjon = f"Converted {i_raw_video_count} raw videos."
+        details = {
+            "service_name": service_name,
+            "raw_videos": summarize_items(raw_videos),
+            "raw_video_count": i_raw_video_count,
+            "error_count": i_error_count,
+            "transcode_jobs": summarize_transcode_jobs(transcode_jobs),
+            "remux_count": sum(job.get("path") == "remux" for job in transcode_jobs),
+            "transcode_queue": TranscodeService().queue_depth(),
+            "capture_watcher": watcher.stats(),
+            "work_journal": work_journal.stats(),
+        }
+
+        # upload videos to cloud storage in parallel, smallest files first
         url_video = ""
         if storage_mode == "cloud_storage":
-            new_videos = PhotosFileAdapter().get_all_capture_files(event["id"], "local_storage")
+            new_videos = watcher.take_ready(PhotosFileAdapter().get_capture_folder_path())
+            self.work_found += len(new_videos)
             for video in new_videos:
-                try:
-                    # upload video to cloud storage
-                    url_video = GoogleCloudStorageAdapter().upload_blob(event["id"], "CAPTURE", video["url"])
-
-                    # archive video - ignore errors
-                    try:
-                        PhotosFileAdapter().move_to_capture_archive(
-                            event["id"],
-                            "local_storage",
-                            video["name"],
-                        )
-                    except Exception:
-                        error_text = f"{service_name} - Error moving file {video["name"]} to local archive."
-                        logging.exception(error_text)
-
-                    i_video_count += 1
-
-                except Exception as e:
-                    informasjon = "Error uploading captured video."
-                    details = {
-                        "video_name": video["name"],
-                        "video_url": video["url"],
-                        "service_name": service_name,
-                        "exception": str(e)
-                    }
+                video["size"] = get_file_size(video["url"])
+            new_videos.sort(key=lambda video: video["size"])
+            upload_limit = asyncio.Semaphore(CAPTURE_UPLOAD_CONCURRENCY)
+            uploads = await asyncio.gather(
+                *(
+                    self.upload_captured_video(token, event, status_type, video, upload_limit)
+                    for video in new_videos
+                )
+            )
+            for upload in uploads:
+                if "exception" in upload:
                     i_error_count += 1
-                    await StatusAdapter().create_status(
-                        token,
-                        event,
-                        status_type,
-                        informasjon,
-                        details
-                    )
-                    logging.exception(informasjon)
-                    PhotosFileAdapter().move_to_error_archive(
-                        event["id"],
-                        "local_storage",
-                        video["name"],
-                    )
+                else:
+                    i_video_count += 1
+                    url_video = upload["url"]
             informasjon = f"Pushed {i_video_count} videos."
-            details = {
-                "service_name": service_name,
-                "raw_videos": raw_videos,
+            details.update({
                 "video_count": i_video_count,
-                "raw_video_count": i_raw_video_count,
                 "video_url": url_video,
-                "error_count": i_error_count
-            }
+                "error_count": i_error_count,
+                "uploads": summarize_uploads(uploads),
+            })
+        else:
+            # converted videos stay in the capture folder, it is scanned again if uploads start later
+            watcher.clear(PhotosFileAdapter().get_capture_folder_path())
         if (i_error_count > 0) or (i_video_count > 0):
-            await StatusAdapter().create_status(
+            status_sink.submit(
                 token,
                 event,
                 status_type,
@@ -289,7 +668,7 @@ async def find_race_info_by_bib(
     raceduration = await ConfigAdapter().get_config_int(
         token, event["id"], "RACE_DURATION_ESTIMATE"
     )
-    starter = await StartAdapter().get_start_entries_by_bib(token, event["id"], bib)
+    starter = await find_start_entries_by_bib(token, event["id"], bib)
     if len(starter) > 0:
         for start in starter:
             # check heat (if not already found)
@@ -308,11 +687,8 @@ async def find_race_info_by_bib(
                     # Get klubb and klasse
                     if bib not in photo_info["biblist"]:
                         try:
-                            contestant = (
-                                await ContestantsAdapter().get_contestant_by_bib(
-                                    token, event["id"], bib
-                                )
-                            )
+                            bib_index = await get_bib_index(token, event["id"])
+                            contestant = bib_index.contestants.get(bib, {})
                             if contestant:
                                 photo_info["biblist"].append(bib)
                                 if contestant["club"] not in photo_info["clublist"]:
@@ -337,25 +713,20 @@ async def find_race_info_by_time(
     raceduration = await ConfigAdapter().get_config_int(
         token, event["id"], "RACE_DURATION_ESTIMATE"
     )
-    all_races = await RaceplansAdapter().get_all_races(token, event["id"])
-    best_fit_race = {
-        "race_id": "",
-        "seconds_diff": BIG_DIFF,
-        "raceclass": "",
-    }
-    for race in all_races:
-        seconds_diff = abs(
-            await get_seconds_diff(token, event, photo_info["information"]["passeringstid"], race["start_time"])
-            - raceduration
-        )
-
-        if seconds_diff < best_fit_race["seconds_diff"]:
-            best_fit_race["seconds_diff"] = seconds_diff
-            best_fit_race["race_id"] = race["id"]
-            best_fit_race["raceclass"] = race["raceclass"]
-            best_fit_race["name"] = f"{race['round']}{race['index']}{race['heat']}"
-
-    if best_fit_race["seconds_diff"] < BIG_DIFF:
+    race_index = await get_race_index(token, event["id"])
+    photo_epoch = race_index.parse_epoch(photo_info["information"]["passeringstid"])
+    if photo_epoch is None:
+        return result
+    best_fit = race_index.find_best_fit(photo_epoch, raceduration)
+
+    if best_fit and best_fit[1] < BIG_DIFF:
+        race, seconds_diff = best_fit
+        best_fit_race = {
+            "race_id": race["id"],
+            "seconds_diff": seconds_diff,
+            "raceclass": race["raceclass"],
+            "name": f"{race['round']}{race['index']}{race['heat']}",
+        }
         photo_info["race_id"] = best_fit_race["race_id"]
         photo_info["raceclass"] = best_fit_race["raceclass"]
         result = HTTPStatus.OK  # OK, found a heat
@@ -377,18 +748,16 @@ def find_raceclass(ageclass: str, raceclasses: list) -> str:
 
 async def format_time(token: str, event: dict, timez: str) -> str:
     """Convert to normalized time - string formats."""
-    time = ""
-    t1 = None
     date_patterns = await ConfigAdapter().get_config(token, event["id"], "DATE_PATTERNS")
-    date_pattern_list = date_patterns.split(";")
-    for pattern in date_pattern_list:
-        try:
-            t1 = datetime.datetime.strptime(timez, pattern).replace(tzinfo=datetime.UTC)
-        except ValueError:
-            logging.debug(f"Got error parsing time {ValueError}")
-    if t1:
-        time = f"{t1.strftime('%Y')}-{t1.strftime('%m')}-{t1.strftime('%d')}T{t1.strftime('%X')}"
-    return time
+    return get_time_parser(date_patterns).format_time(timez)
+
+
+def get_file_size(file_path: str) -> int:
+    """Get file size in bytes, 0 if file is not readable."""
+    try:
+        return Path(file_path).stat().st_size
+    except OSError:
+        return 0
 
 
 def group_photos(photo_list: list[str]) -> dict[str, dict[str, str]]:
@@ -432,26 +801,6 @@ def get_image_description(file_path: str) -> dict:
     return image_info
 
 
-async def get_seconds_diff(token: str, event: dict, time1: str, time2: str) -> int:
-    """Compare time1 and time2, return time diff in min."""
-    t1 = datetime.datetime.strptime("1", "%S").replace(tzinfo=datetime.UTC)  # Initialize time to zero
-    t2 = datetime.datetime.strptime("1", "%S").replace(tzinfo=datetime.UTC)
-
-    date_patterns = await ConfigAdapter().get_config(token, event["id"], "DATE_PATTERNS")
-    date_pattern_list = date_patterns.split(";")
-    for pattern in date_pattern_list:
-        try:
-            t1 = datetime.datetime.strptime(time1, pattern).replace(tzinfo=datetime.UTC)
-        except ValueError:
-            logging.debug(f"Got error parsing time {ValueError}")
-        try:
-            t2 = datetime.datetime.strptime(time2, pattern).replace(tzinfo=datetime.UTC)
-        except ValueError:
-            logging.debug(f"Got error parsing time {ValueError}")
-
-    return int((t1 - t2).total_seconds())
-
-
 async def verify_heat_time(
     token: str,
     event: dict,
@@ -462,12 +811,15 @@ async def verify_heat_time(
     """Analyse photo tags and identify heat."""
     foundheat = ""
     if datetime_foto is not None:
-        race = await RaceplansAdapter().get_race_by_id(token, race_id)
-        if race is not None:
+        race_index = await get_race_index(token, event["id"])
+        race = race_index.races.get(race_id)
+        photo_epoch = race_index.parse_epoch(datetime_foto)
+        start_epoch = race_index.start_epoch(race_id)
+        if race is not None and photo_epoch is not None and start_epoch is not None:
             max_time_dev = await ConfigAdapter().get_config_int(
                 token, event["id"], "RACE_TIME_DEVIATION_ALLOWED"
             )
-            seconds = await get_seconds_diff(token, event, datetime_foto, race["start_time"])
+            seconds = int(photo_epoch - start_epoch)
             if 0 < seconds < (max_time_dev + raceduration):
                 foundheat = race["id"]
                 race_name = (
@@ -0,0 +1,79 @@
+"""Module for parsing time strings with the configured date patterns."""
+
+import datetime as dt
+import functools
+import os
+
+TIME_PARSE_CACHE_SIZE = int(os.getenv("TIME_PARSE_CACHE_SIZE", "4096"))
+
+# input shape - all digits replaced by 9, i.e. "9999-99-99T99:99:99"
+_DIGITS_TO_NINE = str.maketrans("0123456789", "9999999999")
+
+
+class TimeParser:
+    """Class representing the date patterns of DATE_PATTERNS, split once.
+
+    The pattern that matched is remembered per input shape, so later inputs
+    with the same shape are parsed with one strptime call. Results are kept
+    in an LRU cache, race start times are parsed only once.
+    """
+
+    def __init__(self, date_patterns: str) -> None:
+        """Initialize parser for semicolon separated date patterns."""
+        self.date_patterns = date_patterns
+        self.patterns = [pattern for pattern in date_patterns.split(";") if pattern]
+        self._pattern_by_shape: dict[str, str] = {}
+        self.parse = functools.lru_cache(maxsize=TIME_PARSE_CACHE_SIZE)(self._parse)
+
+    def _parse(self, timez: str) -> dt.datetime | None:
+        """Parse time string as UTC, None if no pattern matches."""
+        shape = timez.translate(_DIGITS_TO_NINE)
+        known_pattern = self._pattern_by_shape.get(shape)
+        if known_pattern:
+            try:
+                return dt.datetime.strptime(timez, known_pattern).replace(
+                    tzinfo=dt.UTC
+                )
+            except ValueError:
+                pass  # same shape, but not a valid time for this pattern
+        for pattern in self.patterns:
+            if pattern == known_pattern:
+                continue
+            try:
+                t1 = dt.datetime.strptime(timez, pattern).replace(tzinfo=dt.UTC)
+            except ValueError:
+                continue
+            self._pattern_by_shape[shape] = pattern
+            return t1
+        return None
+
+    def parse_epoch(self, timez: str) -> float | None:
+        """Parse time string, return epoch seconds."""
+        t1 = self.parse(timez)
+        return t1.timestamp() if t1 else None
+
+    def format_time(self, timez: str) -> str:
+        """Convert to normalized time string, empty string if no pattern matches."""
+        t1 = self.parse(timez)
+        return t1.strftime("%Y-%m-%dT%X") if t1 else ""
+
+    def cache_info(self) -> dict:
+        """Get parse cache counters."""
+        info = self.parse.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "shapes": len(self._pattern_by_shape),
+        }
+
+
+_time_parsers: dict[str, TimeParser] = {}
+
+
+def get_time_parser(date_patterns: str) -> TimeParser:
+    """Get parser for date patterns, created once per distinct DATE_PATTERNS value."""
+    time_parser = _time_parsers.get(date_patterns)
+    if time_parser is None:
+        time_parser = _time_parsers[date_patterns] = TimeParser(date_patterns)
+    return time_parser
@@ -0,0 +1,76 @@
+"""Module for login token management."""
+
+import asyncio
+import logging
+import os
+import time
+
+import jwt
+
+from .user_adapter import UserAdapter
+
+# refresh token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "60"))
+
+
+def decode_expiry(token: str) -> float | None:
+    """Get exp claim of JWT as epoch seconds, None if token has no readable exp."""
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+    except jwt.PyJWTError:
+        logging.debug("Token is not a readable JWT, it is refreshed on 401 only.")
+        return None
+    exp = claims.get("exp")
+    return float(exp) if isinstance(exp, int | float) else None
+
+
+class TokenManager:
+    """Class representing the login token shared by all tasks.
+
+    The token is refreshed ahead of its expiry (exp claim, signature is not
+    verified here) and when a request is rejected with 401. Concurrent
+    refreshes are single-flight - tasks waiting for the lock reuse the token
+    fetched by the first one.
+    """
+
+    def __init__(self, username: str, password: str) -> None:
+        """Initialize without token, the first get_token() logs in."""
+        self.username = username
+        self.password = password
+        self.token = ""
+        self.expires_at: float | None = None
+        self.refresh_count = 0
+        self._lock = asyncio.Lock()
+
+    def is_valid(self) -> bool:
+        """Check if token exists and is not about to expire."""
+        if not self.token:
+            return False
+        return self.expires_at is None or time.time() < self.expires_at - TOKEN_REFRESH_MARGIN
+
+    async def get_token(self) -> str:
+        """Get valid token, log in if needed."""
+        if self.is_valid():
+            return self.token
+        return await self.refresh(self.token)
+
+    async def refresh(self, stale_token: str) -> str:
+        """Log in again, unless another task already replaced stale_token."""
+        async with self._lock:
+            if self.token != stale_token and self.is_valid():
+                return self.token
+            token = await UserAdapter().login(self.username, self.password)
+            if not token:
+                self.token = ""
+                informasjon = "Login failed - no token received."
+                raise Exception(informasjon)
+            self.token = token
+            self.expires_at = decode_expiry(token)
+            self.refresh_count += 1
+            logging.info(f"Login token refreshed, expires at {self.expires_at}.")
+            return token
+
+    def invalidate(self, token: str) -> None:
+        """Mark token as rejected, next get_token() logs in again."""
+        if self.token == token:
+            self.token = ""
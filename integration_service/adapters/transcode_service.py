@@ -0,0 +1,148 @@
+"""Module for video transcoding service."""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+from .photos_file_adapter import PhotosFileAdapter
+
+FFMPEG_MAX_JOBS = int(os.getenv("FFMPEG_MAX_JOBS", str(os.cpu_count() or 1)))
+FFMPEG_TIMEOUT = float(os.getenv("FFMPEG_TIMEOUT", "300"))
+FFPROBE_TIMEOUT = float(os.getenv("FFPROBE_TIMEOUT", "30"))
+# codecs that can be copied into MP4 without re-encoding
+FFMPEG_REMUX_CODECS = os.getenv("FFMPEG_REMUX_CODECS", "h264").split(",")
+
+_ffmpeg_slots = asyncio.Semaphore(FFMPEG_MAX_JOBS)
+# jobs waiting for a free slot and jobs running, with peaks since the last convert_all()
+_transcode_queue = {"queued": 0, "running": 0, "peak_queued": 0, "peak_running": 0}
+
+
+def change_queue_depth(key: str, delta: int) -> None:
+    """Change number of queued or running jobs and keep track of the peak."""
+    _transcode_queue[key] += delta
+    _transcode_queue[f"peak_{key}"] = max(_transcode_queue[f"peak_{key}"], _transcode_queue[key])
+
+
+def delete_file(file_path: Path) -> None:
+    """Delete file if it exists."""
+    file_path.unlink(missing_ok=True)
+
+
+class TranscodeService:
+    """Class representing a pool of asynchronous FFmpeg jobs for raw captured videos."""
+
+    def queue_depth(self) -> dict:
+        """Get number of queued and running transcoding jobs, and peaks during last batch."""
+        return {**_transcode_queue, "max_jobs": FFMPEG_MAX_JOBS}
+
+    async def convert_raw_to_mp4(self, input_file: str) -> dict:
+        """Convert (and repair) a raw video to MP4 without blocking the event loop.
+
+        Videos already encoded with a codec in FFMPEG_REMUX_CODECS are remuxed
+        with stream copy, a full re-encode is only done if that is not possible.
+
+        Returns:
+            Job stats with file name, codec, conversion path and time in seconds
+
+        """
+        change_queue_depth("queued", 1)
+        async with _ffmpeg_slots:
+            change_queue_depth("queued", -1)
+            change_queue_depth("running", 1)
+            started = time.monotonic()
+            try:
+                codec = await self.probe_video_codec(input_file)
+                conversion_path = "transcode"
+                if codec in FFMPEG_REMUX_CODECS:
+                    command, output_path = PhotosFileAdapter().get_remux_command(input_file)
+                    try:
+                        await self.run_ffmpeg(command, input_file, output_path)
+                        conversion_path = "remux"
+                    except Exception:
+                        logging.exception(f"Remux failed, re-encoding {input_file}")
+                        conversion_path = "transcode_fallback"
+                if conversion_path != "remux":
+                    command, output_path = PhotosFileAdapter().get_convert_command(input_file)
+                    await self.run_ffmpeg(command, input_file, output_path)
+            finally:
+                change_queue_depth("running", -1)
+        seconds = time.monotonic() - started
+
+        delete_file(Path(input_file))
+        logging.debug(f"Deleted raw video file: {input_file}")
+        return {
+            "name": Path(input_file).name,
+            "codec": codec,
+            "path": conversion_path,
+            "seconds": round(seconds, 3),
+        }
+
+    async def probe_video_codec(self, input_file: str) -> str:
+        """Get codec name of first video stream, empty string if it can not be probed."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *PhotosFileAdapter().get_probe_command(input_file),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            logging.exception("FFprobe not available, videos will be re-encoded")
+            return ""
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), FFPROBE_TIMEOUT)
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            logging.warning(f"FFprobe timeout for {input_file}")
+            return ""
+        if process.returncode != 0:
+            return ""
+        return stdout.decode(errors="replace").strip().lower()
+
+    async def run_ffmpeg(self, command: list[str], input_file: str, output_path: Path) -> None:
+        """Run FFmpeg command, kill it and remove partial output on error or timeout."""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), FFMPEG_TIMEOUT)
+        except TimeoutError as e:
+            process.kill()
+            await process.wait()
+            delete_file(output_path)
+            informasjon = f"FFmpeg timeout after {FFMPEG_TIMEOUT} seconds for {input_file}"
+            raise Exception(informasjon) from e
+        if process.returncode != 0:
+            delete_file(output_path)
+            error_tail = stderr.decode(errors="replace").strip()[-500:]
+            informasjon = f"FFmpeg command failed with error for {input_file}: {error_tail}"
+            raise Exception(informasjon)
+
+    async def convert_all(self, raw_videos: list[dict]) -> list[dict]:
+        """Convert raw videos in parallel, failed videos are moved to error archive.
+
+        Peak queue depth is counted from the start of the batch, so
+        queue_depth() afterwards shows how many jobs had to wait.
+
+        Returns:
+            Job stats per video, with exception text for failed jobs
+
+        """
+
+        async def convert(raw_video: dict) -> dict:
+            try:
+                return await self.convert_raw_to_mp4(raw_video["url"])
+            except Exception as e:
+                logging.exception(f"Error converting raw video {raw_video['name']}")
+                PhotosFileAdapter().move_raw_to_error_archive(raw_video["name"])
+                return {"name": raw_video["name"], "exception": str(e)}
+
+        _transcode_queue["peak_queued"] = _transcode_queue["queued"]
+        _transcode_queue["peak_running"] = _transcode_queue["running"]
+        return await asyncio.gather(*(convert(raw_video) for raw_video in raw_videos))
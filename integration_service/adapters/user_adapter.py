@@ -4,9 +4,11 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs
+from aiohttp import hdrs
 from multidict import MultiDict
 
+from .http_client import get_session
+
 # Get environment variables with validation
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
@@ -33,7 +35,7 @@ class UserAdapter:
                 (hdrs.CONTENT_TYPE, "application/json"),
             ]
         )
-        async with ClientSession() as session, session.post(
+        async with get_session().post(
             f"{USER_SERVICE_URL}/login", headers=headers, json=request_body
         ) as resp:
             result = resp.status
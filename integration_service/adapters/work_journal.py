@@ -0,0 +1,108 @@
+"""Module for local journal of processing stages."""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+WORK_JOURNAL_PATH = os.getenv(
+    "WORK_JOURNAL_PATH", f"{Path.cwd()}/integration_service/files/work_journal.db"
+)
+# finished items are kept this long, so late duplicates are still recognized
+WORK_JOURNAL_RETENTION = float(os.getenv("WORK_JOURNAL_RETENTION", str(7 * 24 * 3600)))
+
+CAPTURE = "capture"
+DETECTION = "detection"
+
+
+class WorkJournal:
+    """Class representing a SQLite (WAL mode) journal of stage transitions per work item.
+
+    Captures are recorded as uploaded, then archived. Detections are recorded
+    as created (with photo id), then archived. After a crash an item is resumed
+    from its last recorded stage instead of being uploaded or created again.
+    Failed detections are recorded with a failure count, and as error when
+    they have been moved to DETECT_ERROR.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """Initialize journal, the database is opened on first use."""
+        self.db_path = db_path
+        self._db: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create table if needed."""
+        if self._db is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.db_path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS work_items ("
+                " kind TEXT NOT NULL,"
+                " item_key TEXT NOT NULL,"
+                " stage TEXT NOT NULL,"
+                " data TEXT NOT NULL DEFAULT '{}',"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, item_key))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS work_items_stage ON work_items (kind, stage)")
+            self._db = db
+            self.prune(WORK_JOURNAL_RETENTION)
+        return self._db
+
+    def get(self, kind: str, item_key: str) -> dict | None:
+        """Get last recorded stage and data for item, None if unknown."""
+        row = self._connect().execute(
+            "SELECT stage, data FROM work_items WHERE kind = ? AND item_key = ?",
+            (kind, item_key),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"stage": row[0], "data": json.loads(row[1])}
+
+    def record(self, kind: str, item_key: str, stage: str, data: dict | None = None) -> None:
+        """Record stage transition for item, data from earlier stages is kept."""
+        entry = self.get(kind, item_key)
+        merged = {**(entry["data"] if entry else {}), **(data or {})}
+        self._connect().execute(
+            "INSERT OR REPLACE INTO work_items (kind, item_key, stage, data, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (kind, item_key, stage, json.dumps(merged), time.time()),
+        )
+        logging.debug(f"Journal {kind} {item_key} - {stage}")
+
+    def pending(self, kind: str, stage: str) -> list[tuple[str, dict]]:
+        """Get items of kind whose last recorded stage is stage."""
+        rows = self._connect().execute(
+            "SELECT item_key, data FROM work_items WHERE kind = ? AND stage = ?",
+            (kind, stage),
+        ).fetchall()
+        return [(item_key, json.loads(data)) for item_key, data in rows]
+
+    def prune(self, max_age: float) -> int:
+        """Delete finished or failed items older than max_age seconds, return number deleted."""
+        cursor = self._connect().execute(
+            "DELETE FROM work_items"
+            " WHERE stage IN ('archived', 'error', 'failed') AND updated_at < ?",
+            (time.time() - max_age,),
+        )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Get number of items per kind and stage."""
+        rows = self._connect().execute(
+            "SELECT kind, stage, COUNT(*) FROM work_items GROUP BY kind, stage"
+        ).fetchall()
+        return {f"{kind}_{stage}": count for kind, stage, count in rows}
+
+    def close(self) -> None:
+        """Close database."""
+        if self._db is not None:
+            self._db.close()
+        self._db = None
+
+
+work_journal = WorkJournal(WORK_JOURNAL_PATH)
@@ -4,15 +4,34 @@ import asyncio
 import logging
 import os
 import socket
-from http import HTTPStatus
 from logging.handlers import RotatingFileHandler
 
 from integration_service.adapters import (
     ConfigAdapter,
     EventsAdapter,
-    StatusAdapter,
     SyncService,
-    UserAdapter,
+    TokenManager,
+    close_capture_watcher,
+    close_session,
+    set_token_manager,
+    wait_for_capture_files,
+)
+from integration_service.adapters.config_adapter import config_bool
+from integration_service.adapters.poll_scheduler import (
+    POLL_BACKOFF_FACTOR,
+    POLL_IDLE_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    PollScheduler,
+)
+from integration_service.adapters.resilience import (
+    get_circuit_states,
+    is_transient_error,
+)
+from integration_service.adapters.status_sink import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    status_sink,
 )
 
 # get base settings
@@ -51,99 +70,185 @@ async def main() -> None:
     event = {}
     status_type = ""
     i = 0
+    status_sink.start()
+    token_manager = TokenManager(
+        os.getenv("ADMIN_USERNAME", "a"), os.getenv("ADMIN_PASSWORD", ".")
+    )
+    set_token_manager(token_manager)
     try:
         try:
             # login to data-source
-            token = await do_login()
+            token = await do_login(token_manager)
             event = await get_event(token)
             information = (f"{instance_name} er klar.")
             status_type = await ConfigAdapter().get_config(
                 token, event["id"], "INTEGRATION_SERVICE_STATUS_TYPE"
             )
-            await StatusAdapter().create_status(
-                token, event, status_type, information, event
-            )
+            status_sink.submit(token, event, status_type, information, event, priority=PRIORITY_LOW)
 
+            sync_service = SyncService()
+            scheduler = PollScheduler(POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_BACKOFF_FACTOR)
             while True:
                 try:
+                    # refreshed ahead of expiry - requests also retry once on 401
+                    token = await token_manager.get_token()
                     service_config = await get_service_status(token, event)
                     if service_config["service_start"]:
-                        # run service
-                        await ConfigAdapter().update_config(token, event["id"], "INTEGRATION_SERVICE_RUNNING", "True")
-                        if service_config["storage_mode"] in ["cloud_storage", "local_storage"]:
-                            await SyncService().process_captured_raw_videos(token, event, service_config["storage_mode"])
-                        elif service_config["storage_mode"] in ["pull_detections"]:
-                            await SyncService().pull_photos_from_pubsub(token, event)
-                        else:
-                            raise_invalid_storage_mode(service_config["storage_mode"])
-                        await ConfigAdapter().update_config(token, event["id"], "INTEGRATION_SERVICE_RUNNING", "False")
+                        await run_service(token, event, service_config, sync_service)
                     if i > STATUS_INTERVAL:
                         information = (f"{instance_name} er klar.")
-                        await StatusAdapter().create_status(
-                            token, event, status_type, information, event
+                        status_sink.submit(
+                            token,
+                            event,
+                            status_type,
+                            information,
+                            {
+                                **event,
+                                "cadence": scheduler.stats(),
+                                "detect_backlog": sync_service.detect_backlog,
+                                "circuits": get_circuit_states(),
+                            },
+                            priority=PRIORITY_LOW,
                         )
                         i = 0
                     else:
                         i += 1
-                    # service ready!
-                    await ConfigAdapter().update_config(
+                    # service ready! - only written when the state changes
+                    await ConfigAdapter().update_config_if_changed(
                         token, event["id"], "INTEGRATION_SERVICE_RUNNING", "False"
                     )
-                    await ConfigAdapter().update_config(
+                    await ConfigAdapter().update_config_if_changed(
                         token, event["id"], "INTEGRATION_SERVICE_AVAILABLE", "True"
                     )
-                    await asyncio.sleep(5)
+                    await wait_for_next_cycle(
+                        token, event, service_config, sync_service, scheduler
+                    )
                 except Exception as e:
                     err_string = str(e)
                     logging.exception(err_string)
-                    # try new login if token expired (401 error)
-                    if str(HTTPStatus.UNAUTHORIZED.value) in err_string:
-                        token = await do_login()
-                    else:
-                        await StatusAdapter().create_status(
-                            token,
-                            event,
-                            status_type,
-                            f"Error in {instance_name}. Stopping.",
-                            {"error": err_string},
-                        )
-                        await ConfigAdapter().update_config(
-                            token, event["id"], "INTEGRATION_SERVICE_START", "False"
-                        )
+                    token = await handle_cycle_error(e, token, event, status_type, token_manager)
+                    await scheduler.sleep_after_error()
         except Exception as e:
             err_string = str(e)
             logging.exception(err_string)
-            await StatusAdapter().create_status(
-                token, event, status_type, "Critical Error - exiting program", {"error": err_string}
+            status_sink.submit(
+                token,
+                event,
+                status_type,
+                "Critical Error - exiting program",
+                {"error": err_string},
+                priority=PRIORITY_HIGH,
             )
     except asyncio.CancelledError:
         await ConfigAdapter().update_config(
             token, event["id"], "INTEGRATION_SERVICE_RUNNING", "False"
         )
-        await StatusAdapter().create_status(
-            token, event, status_type, f"{instance_name} was cancelled (ctrl-c pressed).", {}
+        status_sink.submit(
+            token,
+            event,
+            status_type,
+            f"{instance_name} was cancelled (ctrl-c pressed).",
+            {},
+            priority=PRIORITY_HIGH,
         )
-    await ConfigAdapter().update_config(
-        token, event["id"], "INTEGRATION_SERVICE_AVAILABLE", "False"
-    )
+    await shutdown(token, event)
     logging.info("Goodbye!")
 
 
+async def run_service(
+    token: str, event: dict, service_config: dict, sync_service: SyncService
+) -> None:
+    """Run one cycle of the service for the configured storage mode."""
+    await ConfigAdapter().update_config_if_changed(
+        token, event["id"], "INTEGRATION_SERVICE_RUNNING", "True"
+    )
+    if service_config["storage_mode"] in ["cloud_storage", "local_storage"]:
+        await sync_service.process_captured_raw_videos(token, event, service_config["storage_mode"])
+    elif service_config["storage_mode"] in ["pull_detections"]:
+        await sync_service.pull_photos_from_pubsub(token, event)
+    else:
+        raise_invalid_storage_mode(service_config["storage_mode"])
+    await ConfigAdapter().update_config_if_changed(
+        token, event["id"], "INTEGRATION_SERVICE_RUNNING", "False"
+    )
+
+
+async def handle_cycle_error(
+    error: Exception, token: str, event: dict, status_type: str, token_manager: TokenManager
+) -> str:
+    """Handle error in a service cycle, return token for the next cycle.
+
+    Transient backend errors keep the service started, other errors stop it.
+    """
+    err_string = str(error)
+    # try new login if token was rejected
+    if not token_manager.is_valid():
+        return await do_login(token_manager)
+    if is_transient_error(error):
+        # backend hiccup - keep service started, retry with backoff
+        status_sink.submit(
+            token,
+            event,
+            status_type,
+            f"Temporary error in {instance_name}. Retrying.",
+            {"error": err_string},
+        )
+    else:
+        status_sink.submit(
+            token,
+            event,
+            status_type,
+            f"Error in {instance_name}. Stopping.",
+            {"error": err_string},
+            priority=PRIORITY_HIGH,
+        )
+        await ConfigAdapter().update_config(
+            token, event["id"], "INTEGRATION_SERVICE_START", "False"
+        )
+    return token
+
+
+async def wait_for_next_cycle(
+    token: str,
+    event: dict,
+    service_config: dict,
+    sync_service: SyncService,
+    scheduler: PollScheduler,
+) -> None:
+    """Wait before next cycle, return early when there is new work or a config change."""
+    if not service_config["service_start"]:
+        # not started - react quickly to a start command
+        await ConfigAdapter().wait_for_config_change(token, event["id"], POLL_IDLE_INTERVAL)
+        return
+    delay = scheduler.record_cycle(sync_service.work_found, sync_service.drain_pending)
+    if delay > 0:
+        # wake up early when new capture files arrive
+        await wait_for_capture_files(delay)
+
+
+async def shutdown(token: str, event: dict) -> None:
+    """Mark service as unavailable and release shared connections."""
+    try:
+        await ConfigAdapter().update_config(
+            token, event["id"], "INTEGRATION_SERVICE_AVAILABLE", "False"
+        )
+    finally:
+        await status_sink.stop()
+        close_capture_watcher()
+        await close_session()
+
+
 def raise_invalid_storage_mode(storage_mode: str) -> None:
     """Raise exception for invalid storage mode."""
     err_string = f"Invalid storage mode: {storage_mode}."
     raise Exception(err_string)
 
 
-async def do_login() -> str:
-    """Login to data-source."""
-    uid = os.getenv("ADMIN_USERNAME", "a")
-    pw = os.getenv("ADMIN_PASSWORD", ".")
+async def do_login(token_manager: TokenManager) -> str:
+    """Login to data-source, wait until it is available."""
     while True:
         try:
-            token = await UserAdapter().login(uid, pw)
-            if token:
-                return token
+            return await token_manager.get_token()
         except Exception as e:
             err_string = str(e)
             logging.info(err_string)
@@ -188,23 +293,23 @@ async def get_event(token: str) -> dict:
 
 async def get_service_status(token: str, event: dict) -> dict:
     """Get config details - use info from db."""
-    service_available = await ConfigAdapter().get_config_bool(
-        token, event["id"], "INTEGRATION_SERVICE_AVAILABLE"
-    )
-    service_running = await ConfigAdapter().get_config_bool(
-        token, event["id"], "INTEGRATION_SERVICE_RUNNING"
-    )
-    service_start = await ConfigAdapter().get_config_bool(
-        token, event["id"], "INTEGRATION_SERVICE_START"
-    )
-    storage_mode = await ConfigAdapter().get_config(
-        token, event["id"], "VIDEO_STORAGE_MODE"
+    # one (conditional) snapshot fetch, missing keys are resolved concurrently
+    configs = await ConfigAdapter().get_configs(
+        token,
+        event["id"],
+        [
+            "INTEGRATION_SERVICE_AVAILABLE",
+            "INTEGRATION_SERVICE_RUNNING",
+            "INTEGRATION_SERVICE_START",
+            "VIDEO_STORAGE_MODE",
+        ],
+        refresh=True,
     )
     return {
-        "service_available": service_available,
-        "service_running": service_running,
-        "service_start": service_start,
-        "storage_mode": storage_mode
+        "service_available": config_bool(configs["INTEGRATION_SERVICE_AVAILABLE"]),
+        "service_running": config_bool(configs["INTEGRATION_SERVICE_RUNNING"]),
+        "service_start": config_bool(configs["INTEGRATION_SERVICE_START"]),
+        "storage_mode": configs["VIDEO_STORAGE_MODE"],
     }
 
 
@@ -0,0 +1 @@
+"""Test suite for the integration-service package."""
@@ -0,0 +1,76 @@
+"""Unit test cases for the Vision AI result cache."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from integration_service.adapters.ai_result_cache import AiResultCache
+
+RESULT = {"ai_numbers": [12], "ai_crop_numbers": [12, 12], "ai_text": ["Bib 12"]}
+ENTRY_BYTES = len(json.dumps(RESULT))
+
+
+@pytest.mark.unit
+def test_make_key() -> None:
+    """Should key results by blob content and confidence limit."""
+    cache = AiResultCache("unused", ENTRY_BYTES)
+    detection = {"md5_hash": "abc", "generation": 1}
+
+    key = cache.make_key(detection, "80")
+
+    assert key == cache.make_key({"md5_hash": "abc"}, "80")
+    assert key != cache.make_key(detection, "90")
+    assert cache.make_key({"url": "no content id"}, "80") == ""
+
+
+@pytest.mark.unit
+def test_hit_and_miss_counters(tmp_path: Path) -> None:
+    """Should count hits and misses, and return stored results."""
+    cache = AiResultCache(str(tmp_path), 10 * ENTRY_BYTES)
+
+    assert cache.get("k1") is None
+    cache.put("k1", RESULT)
+
+    assert cache.get("k1") == RESULT
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": ENTRY_BYTES}
+
+
+@pytest.mark.unit
+def test_lru_eviction(tmp_path: Path) -> None:
+    """Should evict least recently used entries above max size."""
+    cache = AiResultCache(str(tmp_path), 2 * ENTRY_BYTES)
+    cache.put("k1", RESULT)
+    cache.put("k2", RESULT)
+    cache.get("k1")  # k2 is now least recently used
+
+    cache.put("k3", RESULT)
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") == RESULT
+    assert cache.get("k3") == RESULT
+    assert not (tmp_path / "k2.json").exists()
+    assert cache.stats()["bytes"] == 2 * ENTRY_BYTES
+
+
+@pytest.mark.unit
+def test_index_loaded_from_disk(tmp_path: Path) -> None:
+    """Should find entries written before a restart."""
+    AiResultCache(str(tmp_path), 10 * ENTRY_BYTES).put("k1", RESULT)
+
+    cache = AiResultCache(str(tmp_path), 10 * ENTRY_BYTES)
+
+    assert cache.get("k1") == RESULT
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.unit
+def test_unreadable_entry_dropped(tmp_path: Path) -> None:
+    """Should count an unreadable entry as a miss and remove it."""
+    cache = AiResultCache(str(tmp_path), 10 * ENTRY_BYTES)
+    cache.put("k1", RESULT)
+    (tmp_path / "k1.json").write_text("{not json")
+
+    assert cache.get("k1") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.misses == 1
@@ -0,0 +1,105 @@
+"""Unit test cases for the capture folder watcher in polling mode."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from integration_service.adapters.capture_watcher import CaptureWatcher
+
+
+@pytest.fixture
+def folders(tmp_path: Path) -> tuple[str, str]:
+    """Create capture and raw capture folders."""
+    capture_folder = tmp_path / "CAPTURE"
+    raw_folder = tmp_path / "RAW_CAPTURE"
+    capture_folder.mkdir()
+    raw_folder.mkdir()
+    return str(capture_folder), str(raw_folder)
+
+
+@pytest.fixture
+def watcher(folders: tuple[str, str]) -> CaptureWatcher:
+    """Watcher polling both folders, TMP files are ignored in the raw folder."""
+    capture_folder, raw_folder = folders
+    return CaptureWatcher([capture_folder, raw_folder], {raw_folder: ("TMP",)})
+
+
+def write_file(folder: str, name: str, data: bytes, age: float = 0) -> Path:
+    """Write file, with modification time age seconds ago."""
+    path = Path(folder, name)
+    with path.open("ab") as f:
+        f.write(data)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def names(files: list[dict]) -> list[str]:
+    """Get names of files."""
+    return [f["name"] for f in files]
+
+
+@pytest.mark.unit
+def test_changing_file_not_queued(watcher: CaptureWatcher, folders: tuple[str, str]) -> None:
+    """Should wait until size and modification time are stable."""
+    capture_folder, _ = folders
+    write_file(capture_folder, "video.mp4", b"part 1")
+
+    assert watcher.take_ready(capture_folder) == []
+
+    # still written, but modification time already older than the settle time
+    write_file(capture_folder, "video.mp4", b"part 2", age=10)
+
+    assert watcher.take_ready(capture_folder) == []
+    assert watcher.stats()["unsettled"] == 1
+    assert names(watcher.take_ready(capture_folder)) == ["video.mp4"]
+    assert watcher.stats()["unsettled"] == 0
+
+
+@pytest.mark.unit
+def test_settled_file_queued_once(watcher: CaptureWatcher, folders: tuple[str, str]) -> None:
+    """Should return a settled file once, also when it is queued for retry as well."""
+    capture_folder, _ = folders
+    video = write_file(capture_folder, "video.mp4", b"video", age=10)
+    watcher.queue_file(capture_folder, "video.mp4")
+
+    assert names(watcher.take_ready(capture_folder)) == ["video.mp4"]
+
+    video.unlink()
+
+    assert watcher.take_ready(capture_folder) == []
+
+
+@pytest.mark.unit
+def test_tmp_files_ignored_in_raw_folder(
+    watcher: CaptureWatcher, folders: tuple[str, str]
+) -> None:
+    """Should skip TMP files in the raw folder only."""
+    capture_folder, raw_folder = folders
+    for folder in folders:
+        write_file(folder, "TMP_video.mp4", b"video", age=10)
+        write_file(folder, "video.mp4", b"video", age=10)
+    watcher.queue_file(raw_folder, "TMP_video.mp4")
+
+    assert sorted(names(watcher.take_ready(capture_folder))) == ["TMP_video.mp4", "video.mp4"]
+    assert names(watcher.take_ready(raw_folder)) == ["video.mp4"]
+
+
+@pytest.mark.unit
+def test_clear_forces_rescan(watcher: CaptureWatcher, folders: tuple[str, str]) -> None:
+    """Should find files left in a cleared folder on the next take_ready."""
+    capture_folder, _ = folders
+    # watched folders are only scanned when a rescan is due
+    watcher._watches[1] = capture_folder  # noqa: SLF001
+    assert watcher.take_ready(capture_folder) == []
+    write_file(capture_folder, "video.mp4", b"video", age=10)
+    watcher.queue_file(capture_folder, "video.mp4")
+    scans = watcher.stats()["scans"]
+
+    watcher.clear(capture_folder)
+
+    assert names(watcher.take_ready(capture_folder)) == ["video.mp4"]
+    assert watcher.stats()["scans"] == scans + 1
+    assert watcher.take_ready(capture_folder) == []
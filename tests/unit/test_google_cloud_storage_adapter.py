@@ -0,0 +1,196 @@
+"""Unit test cases for resumable uploads to cloud storage."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import Forbidden
+
+from integration_service.adapters import google_cloud_storage_adapter as gcs
+from integration_service.adapters.google_cloud_storage_adapter import (
+    GoogleCloudStorageAdapter,
+    committed_bytes,
+    get_upload_offset,
+    get_upload_state_file,
+    read_upload_state,
+    record_failed_upload_attempt,
+)
+
+SESSION_URL = "https://storage/upload?upload_id=1"
+DESTINATION = "event-1/CAPTURE/video.mp4"
+
+
+class FakeTransport:
+    """Upload session answering PUT requests with responses in order."""
+
+    def __init__(self, *responses: tuple[int, str]) -> None:
+        """Initialize with status codes and committed Range headers to return."""
+        self.responses = list(responses)
+        self.puts: list[dict] = []
+
+    def put(self, url: str, data: bytes = b"", headers: dict | None = None, **_kwargs: object) -> SimpleNamespace:
+        """Record request and return next response."""
+        self.puts.append({"url": url, "data": data, "content_range": (headers or {})["Content-Range"]})
+        status_code, range_header = self.responses.pop(0)
+        return SimpleNamespace(
+            status_code=status_code, headers={"Range": range_header} if range_header else {}
+        )
+
+
+class FakeBlob:
+    """Blob creating upload sessions, or failing to."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Initialize blob."""
+        self.error = error
+        self.sessions = 0
+
+    def create_resumable_upload_session(self, **_kwargs: object) -> str:
+        """Create upload session."""
+        self.sessions += 1
+        if self.error:
+            raise self.error
+        return SESSION_URL
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use 4 byte chunks and keep session state in tmp_path."""
+    monkeypatch.setattr(gcs, "GOOGLE_STORAGE_CHUNK_SIZE", 4)
+    monkeypatch.setattr(gcs, "UPLOAD_SESSION_PATH", str(tmp_path / "upload_sessions"))
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    """Create 10 byte video."""
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"0123456789")
+    return video_file
+
+
+def use_storage(monkeypatch: pytest.MonkeyPatch, transport: FakeTransport, blob: FakeBlob) -> None:
+    """Send storage requests to fake transport and blob."""
+    monkeypatch.setattr(gcs, "get_storage_session", lambda: transport)
+    monkeypatch.setattr(gcs, "get_storage_bucket", lambda: SimpleNamespace(blob=lambda _name: blob))
+
+
+@pytest.mark.unit
+def test_committed_bytes() -> None:
+    """Should count committed bytes from the Range header."""
+    assert committed_bytes("") == 0
+    assert committed_bytes("bytes=0-262143") == 262144
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("status_code", "range_header", "offset"),
+    [(308, "bytes=0-3", 4), (308, "", 0), (200, "", 10), (201, "", 10), (404, "", -1)],
+)
+def test_get_upload_offset(status_code: int, range_header: str, offset: int) -> None:
+    """Should resume from committed bytes, or report a finished or lost session."""
+    transport = FakeTransport((status_code, range_header))
+
+    assert get_upload_offset(transport, SESSION_URL, 10) == offset
+    assert transport.puts[0]["content_range"] == "bytes */10"
+
+
+@pytest.mark.unit
+def test_upload_chunks_seeks_to_committed_bytes(tmp_path: Path, video: Path) -> None:
+    """Should send the next chunk from the last committed byte after a short commit."""
+    transport = FakeTransport((308, "bytes=0-1"), (308, "bytes=0-5"), (308, "bytes=0-9"), (200, ""))
+
+    GoogleCloudStorageAdapter().upload_chunks(
+        transport, video, SESSION_URL, 0, state_file=tmp_path / "state.json"
+    )
+
+    assert [(put["content_range"], put["data"]) for put in transport.puts] == [
+        ("bytes 0-3/10", b"0123"),
+        ("bytes 2-5/10", b"2345"),
+        ("bytes 6-9/10", b"6789"),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("status_code", "kept"), [(503, True), (429, True), (403, False)])
+def test_upload_chunks_rejected(tmp_path: Path, video: Path, status_code: int, kept: bool) -> None:
+    """Should keep the session state only for retryable statuses."""
+    state_file = tmp_path / "state.json"
+    state_file.write_text("{}")
+    transport = FakeTransport((status_code, ""))
+
+    with pytest.raises(Exception, match=f"failed at byte 4 - {status_code}"):
+        GoogleCloudStorageAdapter().upload_chunks(
+            transport, video, SESSION_URL, 4, state_file=state_file
+        )
+
+    assert state_file.exists() == kept
+
+
+@pytest.mark.unit
+def test_record_failed_upload_attempt(tmp_path: Path) -> None:
+    """Should count attempts and drop the session at GOOGLE_STORAGE_UPLOAD_ATTEMPTS."""
+    state_file = tmp_path / "state.json"
+    state = {"session_url": SESSION_URL, "destination": DESTINATION}
+    for attempt in range(1, gcs.GOOGLE_STORAGE_UPLOAD_ATTEMPTS):
+        record_failed_upload_attempt(state_file, state)
+        state = read_upload_state(state_file)
+        assert state["attempts"] == attempt
+
+    record_failed_upload_attempt(state_file, state)
+
+    assert not state_file.exists()
+
+
+@pytest.mark.unit
+def test_upload_resumed_from_stored_session(
+    video: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Should continue a stored session from the committed byte and remove its state."""
+    state_file = get_upload_state_file(DESTINATION)
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text(
+        json.dumps(
+            {
+                "session_url": SESSION_URL,
+                "destination": DESTINATION,
+                "size": 10,
+                "mtime": video.stat().st_mtime,
+                "attempts": 1,
+            }
+        )
+    )
+    transport = FakeTransport((308, "bytes=0-7"), (200, ""))
+    blob = FakeBlob()
+    use_storage(monkeypatch, transport, blob)
+
+    GoogleCloudStorageAdapter().upload_blob_resumable(str(video), DESTINATION)
+
+    assert blob.sessions == 0
+    assert transport.puts[1]["content_range"] == "bytes 8-9/10"
+    assert not state_file.exists()
+
+
+@pytest.mark.unit
+def test_failed_session_start_is_counted(video: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Should keep the file pending when the upload fails before a session exists."""
+    use_storage(monkeypatch, FakeTransport(), FakeBlob(ConnectionError("network down")))
+    adapter = GoogleCloudStorageAdapter()
+
+    with pytest.raises(Exception, match="upload_blob"):
+        adapter.upload_blob("event-1", "CAPTURE", str(video))
+
+    assert adapter.has_pending_upload("event-1", "CAPTURE", str(video))
+    assert read_upload_state(get_upload_state_file(DESTINATION))["attempts"] == 1
+
+
+@pytest.mark.unit
+def test_rejected_session_start_is_dropped(video: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Should not resume an upload when the session is rejected with a non-retryable status."""
+    use_storage(monkeypatch, FakeTransport(), FakeBlob(Forbidden("no access")))
+    adapter = GoogleCloudStorageAdapter()
+
+    with pytest.raises(Exception, match="upload_blob"):
+        adapter.upload_blob("event-1", "CAPTURE", str(video))
+
+    assert not adapter.has_pending_upload("event-1", "CAPTURE", str(video))
@@ -0,0 +1,113 @@
+"""Unit test cases for the bearer token middleware."""
+
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import hdrs
+from multidict import CIMultiDict
+
+from integration_service.adapters import http_client
+from integration_service.adapters.http_client import auth_middleware
+
+
+class FakeTokenManager:
+    """Token manager handing out numbered tokens."""
+
+    def __init__(self) -> None:
+        """Initialize token manager."""
+        self.token = "token-1"  # noqa: S105
+        self.refreshed: list[str] = []
+        self.invalidated: list[str] = []
+
+    async def get_token(self) -> str:
+        """Return current token."""
+        return self.token
+
+    async def refresh(self, stale_token: str) -> str:
+        """Replace the stale token."""
+        self.refreshed.append(stale_token)
+        self.token = f"token-{len(self.refreshed) + 1}"
+        return self.token
+
+    def invalidate(self, token: str) -> None:
+        """Forget the token."""
+        self.invalidated.append(token)
+
+
+class FakeHandler:
+    """Request handler returning status codes in order and recording tokens."""
+
+    def __init__(self, *statuses: int) -> None:
+        """Initialize handler with status codes to return."""
+        self.statuses = list(statuses)
+        self.authorizations: list[str | None] = []
+
+    async def __call__(self, request: SimpleNamespace) -> SimpleNamespace:
+        """Handle one request."""
+        self.authorizations.append(request.headers.get(hdrs.AUTHORIZATION))
+        return SimpleNamespace(status=self.statuses.pop(0), release=lambda: None)
+
+
+def make_request(*, authorized: bool = True) -> SimpleNamespace:
+    """Create request, with or without an Authorization header."""
+    headers = CIMultiDict({hdrs.AUTHORIZATION: "Bearer old"} if authorized else {})
+    return SimpleNamespace(headers=headers)
+
+
+@pytest.fixture
+def token_manager(monkeypatch: pytest.MonkeyPatch) -> FakeTokenManager:
+    """Install a fake token manager."""
+    manager = FakeTokenManager()
+    monkeypatch.setattr(http_client, "_token_manager", manager)
+    return manager
+
+
+@pytest.mark.unit
+async def test_current_token_used(token_manager: FakeTokenManager) -> None:
+    """Should replace the Authorization header with the current token."""
+    handler = FakeHandler(200)
+
+    response = await auth_middleware(make_request(), handler)
+
+    assert response.status == 200
+    assert handler.authorizations == ["Bearer token-1"]
+    assert token_manager.refreshed == []
+
+
+@pytest.mark.unit
+async def test_unauthorized_retried_once(token_manager: FakeTokenManager) -> None:
+    """Should refresh the token on 401 and retry with the new token."""
+    handler = FakeHandler(401, 200)
+
+    response = await auth_middleware(make_request(), handler)
+
+    assert response.status == 200
+    assert handler.authorizations == ["Bearer token-1", "Bearer token-2"]
+    assert token_manager.refreshed == ["token-1"]
+    assert token_manager.invalidated == []
+
+
+@pytest.mark.unit
+async def test_unauthorized_after_refresh(token_manager: FakeTokenManager) -> None:
+    """Should return the second 401 and invalidate the refreshed token."""
+    handler = FakeHandler(401, 401, 200)
+
+    response = await auth_middleware(make_request(), handler)
+
+    assert response.status == 401
+    assert len(handler.authorizations) == 2
+    assert token_manager.invalidated == ["token-2"]
+
+
+@pytest.mark.unit
+async def test_unauthenticated_request_passed_through(
+    token_manager: FakeTokenManager,
+) -> None:
+    """Should not add a token to requests without Authorization header."""
+    handler = FakeHandler(401)
+
+    response = await auth_middleware(make_request(authorized=False), handler)
+
+    assert response.status == 401
+    assert handler.authorizations == [None]
+    assert token_manager.refreshed == []
@@ -0,0 +1,66 @@
+"""Unit test cases for the adaptive poll scheduler."""
+
+import pytest
+
+from integration_service.adapters.poll_scheduler import PollScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch: pytest.MonkeyPatch) -> PollScheduler:
+    """Scheduler from 1 to 30 seconds, without jitter."""
+    scheduler = PollScheduler(min_interval=1, max_interval=30, factor=2)
+    monkeypatch.setattr(scheduler, "_jitter", lambda interval: interval)
+    return scheduler
+
+
+@pytest.mark.unit
+def test_burst_while_more_work_is_pending(scheduler: PollScheduler) -> None:
+    """Should run the next cycle at once while more work is pending."""
+    assert scheduler.mode == "burst"
+
+    assert scheduler.record_cycle(25, more_pending=True) == 0
+    assert scheduler.mode == "burst"
+
+
+@pytest.mark.unit
+def test_active_when_work_is_found(scheduler: PollScheduler) -> None:
+    """Should run cycles min_interval apart while work is found."""
+    scheduler.record_cycle(0, more_pending=False)
+
+    assert scheduler.record_cycle(3, more_pending=False) == 1
+    assert scheduler.mode == "active"
+    assert scheduler.idle_cycles == 0
+
+
+@pytest.mark.unit
+def test_idle_backs_off_to_max_interval(scheduler: PollScheduler) -> None:
+    """Should back off exponentially while idle, up to max_interval."""
+    delays = [scheduler.record_cycle(0, more_pending=False) for _ in range(7)]
+
+    assert delays == [1, 2, 4, 8, 16, 30, 30]
+    assert scheduler.mode == "idle"
+
+
+@pytest.mark.unit
+def test_error_backoff_resets_after_successful_cycle(scheduler: PollScheduler) -> None:
+    """Should back off on errors, and start over after a successful cycle."""
+    delays = [scheduler.record_error() for _ in range(3)]
+
+    assert delays == [1, 2, 4]
+    assert scheduler.mode == "error"
+
+    scheduler.record_cycle(1, more_pending=False)
+
+    assert scheduler.error_cycles == 0
+    assert scheduler.record_error() == 1
+
+
+@pytest.mark.unit
+def test_jitter_stays_within_interval() -> None:
+    """Should spread delays between half and full interval."""
+    scheduler = PollScheduler(min_interval=8, max_interval=8, factor=2)
+
+    delays = [scheduler.record_cycle(0, more_pending=False) for _ in range(50)]
+
+    assert all(4 <= delay <= 8 for delay in delays)
+    assert scheduler.stats()["interval"] == 8
@@ -0,0 +1,112 @@
+"""Unit test cases for the race index."""
+
+import pytest
+
+from integration_service.adapters.race_index import RaceIndex
+
+DATE_PATTERNS = "%Y-%m-%dT%H:%M:%S;%d.%m.%Y %H:%M:%S"
+
+
+def make_race(race_id: str, start_time: str) -> dict:
+    """Create race with start time."""
+    return {
+        "id": race_id,
+        "start_time": start_time,
+        "raceclass": "J15",
+        "round": "Q",
+        "index": "",
+        "heat": 1,
+    }
+
+
+@pytest.fixture
+def race_index() -> RaceIndex:
+    """Race index with three races, five minutes apart."""
+    race_index = RaceIndex()
+    race_index.update(
+        [
+            make_race("r2", "2024-01-01T10:05:00"),
+            make_race("r1", "2024-01-01T10:00:00"),
+            make_race("r3", "2024-01-01T10:10:00"),
+        ],
+        DATE_PATTERNS,
+    )
+    return race_index
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("photo_time", "race_id", "seconds_diff"),
+    [
+        ("2024-01-01T10:07:10", "r2", 70),
+        ("2024-01-01T10:09:00", "r3", 120),
+        ("2024-01-01T09:30:00", "r1", 1860),
+        ("2024-01-01T11:00:00", "r3", 2940),
+    ],
+)
+def test_find_best_fit(
+    race_index: RaceIndex, photo_time: str, race_id: str, seconds_diff: int
+) -> None:
+    """Should find race starting closest to photo time minus race duration."""
+    photo_epoch = race_index.parse_epoch(photo_time)
+    assert photo_epoch is not None
+
+    best_fit = race_index.find_best_fit(photo_epoch, 60)
+
+    assert best_fit is not None
+    assert best_fit[0]["id"] == race_id
+    assert best_fit[1] == seconds_diff
+
+
+@pytest.mark.unit
+def test_find_best_fit_empty_index() -> None:
+    """Should return None when no race has a start time."""
+    assert RaceIndex().find_best_fit(1_700_000_000, 60) is None
+
+
+@pytest.mark.unit
+def test_update_unchanged_raceplan(race_index: RaceIndex) -> None:
+    """Should report no changes when the raceplan is the same."""
+    changes = race_index.update(list(race_index.races.values()), DATE_PATTERNS)
+
+    assert changes == 0
+    assert race_index.race_ids == ["r1", "r2", "r3"]
+
+
+@pytest.mark.unit
+def test_update_changed_and_removed_races(race_index: RaceIndex) -> None:
+    """Should apply changed start times and drop removed races."""
+    changes = race_index.update(
+        [
+            make_race("r1", "2024-01-01T10:00:00"),
+            make_race("r2", "2024-01-01T10:15:00"),
+        ],
+        DATE_PATTERNS,
+    )
+
+    assert changes == 2
+    assert race_index.race_ids == ["r1", "r2"]
+    assert race_index.start_epoch("r3") is None
+    assert "r3" not in race_index.races
+
+
+@pytest.mark.unit
+def test_update_unknown_start_time_format(race_index: RaceIndex) -> None:
+    """Should keep a race with unparsable start time out of the timetable."""
+    races = [*race_index.races.values(), make_race("r4", "10:20")]
+
+    changes = race_index.update(races, DATE_PATTERNS)
+
+    assert changes == 1
+    assert "r4" in race_index.races
+    assert "r4" not in race_index.race_ids
+    assert race_index.start_epoch("r4") is None
+
+
+@pytest.mark.unit
+def test_update_new_date_patterns(race_index: RaceIndex) -> None:
+    """Should parse all start times again when the date patterns change."""
+    changes = race_index.update(list(race_index.races.values()), "%Y-%m-%dT%H:%M:%S")
+
+    assert changes == 3
+    assert race_index.race_ids == ["r1", "r2", "r3"]
@@ -0,0 +1,190 @@
+"""Unit test cases for retries and circuit breakers on backend requests."""
+
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientConnectionError
+from multidict import CIMultiDict
+from yarl import URL
+
+from integration_service.adapters import resilience
+from integration_service.adapters.exceptions import BackendUnavailableError
+from integration_service.adapters.resilience import (
+    CircuitBreaker,
+    get_circuit_states,
+    get_retry_delay,
+    is_transient_error,
+    resilience_middleware,
+)
+
+
+class FakeResponse:
+    """Response with status and headers."""
+
+    def __init__(self, status: int, headers: dict | None = None) -> None:
+        """Initialize response."""
+        self.status = status
+        self.headers = CIMultiDict(headers or {})
+        self.released = False
+
+    def release(self) -> None:
+        """Release response."""
+        self.released = True
+
+
+class FakeHandler:
+    """Request handler returning responses, or raising errors, in order."""
+
+    def __init__(self, *results: int | Exception) -> None:
+        """Initialize handler with status codes or errors to return."""
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self, _request: object) -> FakeResponse:
+        """Handle one request."""
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return FakeResponse(result)
+
+
+def make_request(method: str) -> SimpleNamespace:
+    """Create request to the photos service."""
+    return SimpleNamespace(method=method, url=URL("http://photos:8092/config"))
+
+
+@pytest.fixture(autouse=True)
+def no_delays(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry at once and start every test with closed circuits."""
+    monkeypatch.setattr(resilience, "HTTP_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(resilience, "_circuit_breakers", {})
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Control time seen by the circuit breakers."""
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.unit
+def test_circuit_opens_at_failure_threshold(clock: list[float]) -> None:
+    """Should open after failure_threshold failures in a row."""
+    breaker = CircuitBreaker("photos:8092", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    clock[0] += 29
+    assert not breaker.allow_request()
+
+
+@pytest.mark.unit
+def test_half_open_probe_closes_or_opens_circuit(clock: list[float]) -> None:
+    """Should let one probe through after reset_timeout, its result decides the state."""
+    breaker = CircuitBreaker("photos:8092", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 31
+
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    clock[0] += 31
+    assert breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+@pytest.mark.unit
+async def test_idempotent_request_retried() -> None:
+    """Should retry GET on connection errors and 503, and return the first good response."""
+    handler = FakeHandler(ClientConnectionError(), 503, 200)
+
+    response = await resilience_middleware(make_request("GET"), handler)
+
+    assert response.status == 200
+    assert handler.calls == 3
+    assert get_circuit_states() == {"photos:8092": "closed"}
+
+
+@pytest.mark.unit
+async def test_retries_exhausted() -> None:
+    """Should raise BackendUnavailableError when all attempts failed."""
+    handler = FakeHandler(*[503] * resilience.HTTP_RETRY_ATTEMPTS)
+
+    with pytest.raises(BackendUnavailableError):
+        await resilience_middleware(make_request("GET"), handler)
+
+    assert handler.calls == resilience.HTTP_RETRY_ATTEMPTS
+
+
+@pytest.mark.unit
+async def test_post_not_retried() -> None:
+    """Should send POST only once."""
+    handler = FakeHandler(503, 200)
+
+    with pytest.raises(BackendUnavailableError):
+        await resilience_middleware(make_request("POST"), handler)
+
+    assert handler.calls == 1
+
+
+@pytest.mark.unit
+async def test_client_error_not_retried() -> None:
+    """Should return a 404 at once, it counts as a working backend."""
+    handler = FakeHandler(404, 200)
+
+    response = await resilience_middleware(make_request("GET"), handler)
+
+    assert response.status == 404
+    assert handler.calls == 1
+
+
+@pytest.mark.unit
+async def test_open_circuit_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Should not send requests while the circuit is open."""
+    monkeypatch.setattr(resilience, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(resilience, "HTTP_RETRY_ATTEMPTS", 2)
+    handler = FakeHandler(503, 503, 200)
+
+    with pytest.raises(BackendUnavailableError):
+        await resilience_middleware(make_request("GET"), handler)
+    with pytest.raises(BackendUnavailableError, match="circuit open"):
+        await resilience_middleware(make_request("GET"), handler)
+
+    assert handler.calls == 2
+    assert get_circuit_states() == {"photos:8092": "open"}
+
+
+@pytest.mark.unit
+def test_retry_delay() -> None:
+    """Should honour a numeric Retry-After, up to the max delay."""
+    assert get_retry_delay(1, FakeResponse(429, {"Retry-After": "2"})) == 2
+    assert get_retry_delay(1, FakeResponse(429, {"Retry-After": "3600"})) == (
+        resilience.HTTP_RETRY_MAX_DELAY
+    )
+    assert get_retry_delay(1) == 0
+
+
+@pytest.mark.unit
+def test_is_transient_error() -> None:
+    """Should treat unavailable backends and timeouts as transient."""
+    assert is_transient_error(BackendUnavailableError("photos:8092 unavailable"))
+    assert is_transient_error(TimeoutError())
+    assert not is_transient_error(ValueError("bad config"))
@@ -0,0 +1,100 @@
+"""Unit test cases for the background status sink."""
+
+import pytest
+
+from integration_service.adapters import status_sink as status_sink_module
+from integration_service.adapters.status_sink import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    StatusSink,
+)
+
+EVENT = {"id": "event-1"}
+
+
+@pytest.fixture
+def written(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record status messages instead of writing them to the status backend."""
+    written = []
+
+    async def create_status(
+        _self: object, _token: str, _event: dict, _status_type: str, message: str, details: dict
+    ) -> str:
+        written.append((message, details))
+        return "status-id"
+
+    monkeypatch.setattr(status_sink_module.StatusAdapter, "create_status", create_status)
+    return written
+
+
+@pytest.mark.unit
+async def test_same_message_is_coalesced(written: list) -> None:
+    """Should write repeated messages once, with latest details and repeat count."""
+    sink = StatusSink(max_size=10, batch_size=10, flush_interval=60)
+    sink.submit("token", EVENT, "status", "Pushed 1 videos.", {"n": 1})
+    sink.submit("token", EVENT, "status", "Pushed 1 videos.", {"n": 2})
+
+    await sink.flush()
+
+    assert written == [("Pushed 1 videos.", {"n": 2, "repeat_count": 2})]
+    assert sink.stats() == {"queue_length": 0, "queued": 1, "coalesced": 1, "written": 1}
+
+
+@pytest.mark.unit
+async def test_full_queue_drops_lower_priority(written: list) -> None:
+    """Should drop the oldest lower priority message, or the new one if there is none."""
+    sink = StatusSink(max_size=2, batch_size=10, flush_interval=60)
+    sink.submit("token", EVENT, "status", "low", {}, priority=PRIORITY_LOW)
+    sink.submit("token", EVENT, "status", "normal", {})
+
+    assert sink.submit("token", EVENT, "status", "high", {}, priority=PRIORITY_HIGH)
+    assert not sink.submit("token", EVENT, "status", "another low", {}, priority=PRIORITY_LOW)
+
+    await sink.flush()
+
+    assert [message for message, _ in written] == ["high", "normal"]
+    assert sink.counts["dropped"] == 2
+
+
+@pytest.mark.unit
+async def test_flush_writes_one_batch_highest_priority_first(written: list) -> None:
+    """Should write at most batch_size messages per flush, highest priority first."""
+    sink = StatusSink(max_size=10, batch_size=2, flush_interval=60)
+    sink.submit("token", EVENT, "status", "low", {}, priority=PRIORITY_LOW)
+    sink.submit("token", EVENT, "status", "normal", {})
+    sink.submit("token", EVENT, "status", "high", {}, priority=PRIORITY_HIGH)
+
+    await sink.flush()
+
+    assert [message for message, _ in written] == ["high", "normal"]
+    assert sink.stats()["queue_length"] == 1
+
+
+@pytest.mark.unit
+async def test_failed_write_is_counted(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Should count a failed write without stopping the batch."""
+
+    async def create_status(*_args: object) -> str:
+        raise ConnectionError
+
+    monkeypatch.setattr(status_sink_module.StatusAdapter, "create_status", create_status)
+    sink = StatusSink(max_size=10, batch_size=10, flush_interval=60)
+    sink.submit("token", EVENT, "status", "message", {})
+
+    await sink.flush()
+
+    assert sink.counts["failed"] == 1
+
+
+@pytest.mark.unit
+async def test_stop_writes_remaining_messages(written: list) -> None:
+    """Should write all queued messages before stopping."""
+    sink = StatusSink(max_size=10, batch_size=1, flush_interval=60)
+    sink.start()
+    for i in range(3):
+        sink.submit("token", EVENT, "status", f"message {i}", {})
+
+    await sink.stop()
+
+    assert len(written) == 3
+    assert sink.stats()["queue_length"] == 0
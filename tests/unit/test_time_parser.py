@@ -0,0 +1,74 @@
+"""Unit test cases for the memoizing time parser."""
+
+import datetime as dt
+
+import pytest
+
+from integration_service.adapters.time_parser import TimeParser
+
+DATE_PATTERNS = "%Y-%m-%d %H:%M:%S;%Y-%m-%dT%H:%M:%S;%d.%m.%Y %H:%M:%S"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "timez",
+    ["2024-01-01 10:05:30", "2024-01-01T10:05:30", "01.01.2024 10:05:30"],
+)
+def test_parse_first_matching_pattern(timez: str) -> None:
+    """Should parse with the first pattern that matches, as UTC."""
+    t1 = TimeParser(DATE_PATTERNS).parse(timez)
+
+    assert t1 == dt.datetime(2024, 1, 1, 10, 5, 30, tzinfo=dt.UTC)
+
+
+@pytest.mark.unit
+def test_parse_unknown_format() -> None:
+    """Should return None and empty string when no pattern matches."""
+    time_parser = TimeParser(DATE_PATTERNS)
+
+    assert time_parser.parse("10:05") is None
+    assert time_parser.parse_epoch("10:05") is None
+    assert time_parser.format_time("10:05") == ""
+
+
+@pytest.mark.unit
+def test_format_time() -> None:
+    """Should convert to normalized time string."""
+    assert TimeParser(DATE_PATTERNS).format_time("01.01.2024 10:05:30") == "2024-01-01T10:05:30"
+
+
+@pytest.mark.unit
+def test_pattern_memoized_per_shape(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Should only try the remembered pattern for inputs with a known shape."""
+    time_parser = TimeParser(DATE_PATTERNS)
+    tried_patterns = []
+    strptime = dt.datetime.strptime
+
+    class RecordingDatetime(dt.datetime):
+        @classmethod
+        def strptime(cls, date_string: str, date_format: str) -> dt.datetime:
+            tried_patterns.append(date_format)
+            return strptime(date_string, date_format)
+
+    monkeypatch.setattr(dt, "datetime", RecordingDatetime)
+
+    time_parser.parse("01.01.2024 10:05:30")
+    assert len(tried_patterns) == 3
+
+    tried_patterns.clear()
+    time_parser.parse("02.01.2024 11:00:00")
+    assert tried_patterns == ["%d.%m.%Y %H:%M:%S"]
+    assert time_parser.cache_info()["shapes"] == 1
+
+
+@pytest.mark.unit
+def test_results_are_cached() -> None:
+    """Should parse the same time string only once."""
+    time_parser = TimeParser(DATE_PATTERNS)
+
+    for _ in range(3):
+        time_parser.parse_epoch("2024-01-01T10:05:30")
+
+    cache_info = time_parser.cache_info()
+    assert cache_info["misses"] == 1
+    assert cache_info["hits"] == 2
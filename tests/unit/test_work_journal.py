@@ -0,0 +1,222 @@
+"""Unit test cases for the work journal and resuming work from it."""
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from integration_service.adapters import sync_service
+from integration_service.adapters.exceptions import BackendUnavailableError
+from integration_service.adapters.sync_service import DETECT_MAX_FAILURES, SyncService
+from integration_service.adapters.work_journal import CAPTURE, DETECTION, WorkJournal
+
+EVENT = {"id": "event-1"}
+DETECTION_URL = "https://storage/bucket/event-1/DETECT/photo.jpg"
+
+
+@pytest.fixture
+def journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[WorkJournal]:
+    """Empty journal, also used by the sync service."""
+    journal = WorkJournal(str(tmp_path / "work_journal.db"))
+    monkeypatch.setattr(sync_service, "work_journal", journal)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> dict:
+    """Create captured video in the capture folder."""
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"0" * 100)
+    return {"name": video_file.name, "url": str(video_file), "size": 100}
+
+
+@pytest.fixture
+def uploads(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record uploads and archive moves instead of calling cloud storage."""
+    uploads = []
+
+    async def upload_video_blob(*args: object) -> tuple[str, float]:
+        uploads.append(args[-2]["name"])
+        return "https://storage/bucket/event-1/CAPTURE/video.mp4", 0.5
+
+    def archive_captured_video(_self: SyncService, _event_id: str, video: dict) -> bool:
+        Path(video["url"]).unlink()
+        return True
+
+    monkeypatch.setattr(SyncService, "upload_video_blob", upload_video_blob)
+    monkeypatch.setattr(SyncService, "archive_captured_video", archive_captured_video)
+    return uploads
+
+
+@pytest.mark.unit
+def test_record_keeps_data_of_earlier_stages(journal: WorkJournal) -> None:
+    """Should merge data recorded at each stage."""
+    journal.record(DETECTION, "d1", "created", {"photo_id": "p1"})
+    journal.record(DETECTION, "d1", "archived")
+
+    assert journal.get(DETECTION, "d1") == {"stage": "archived", "data": {"photo_id": "p1"}}
+    assert journal.get(CAPTURE, "d1") is None
+
+
+@pytest.mark.unit
+def test_pending_and_stats(journal: WorkJournal) -> None:
+    """Should list items by last recorded stage."""
+    journal.record(DETECTION, "d1", "created", {"photo_id": "p1"})
+    journal.record(DETECTION, "d2", "archived")
+    journal.record(CAPTURE, "c1", "uploaded")
+
+    assert journal.pending(DETECTION, "created") == [("d1", {"photo_id": "p1"})]
+    assert journal.stats() == {
+        "capture_uploaded": 1,
+        "detection_archived": 1,
+        "detection_created": 1,
+    }
+
+
+@pytest.mark.unit
+def test_prune_keeps_unfinished_items(journal: WorkJournal) -> None:
+    """Should prune finished and failed items, but never items to resume."""
+    journal.record(DETECTION, "d1", "archived")
+    journal.record(DETECTION, "d2", "failed", {"failures": 1})
+    journal.record(DETECTION, "d3", "created")
+
+    assert journal.prune(-1) == 2
+    assert journal.get(DETECTION, "d3") is not None
+
+
+@pytest.mark.unit
+async def test_uploaded_video_is_only_archived(
+    journal: WorkJournal, video: dict, uploads: list
+) -> None:
+    """Should resume an uploaded video without uploading it again."""
+    journal.record(
+        CAPTURE, "event-1/video.mp4", "uploaded", {"url": "https://uploaded", "bytes": 100}
+    )
+
+    upload_stats = await SyncService().upload_captured_video(
+        "token", EVENT, "status", video, asyncio.Semaphore(1)
+    )
+
+    assert uploads == []
+    assert upload_stats["resumed"]
+    assert upload_stats["url"] == "https://uploaded"
+    assert journal.get(CAPTURE, "event-1/video.mp4")["stage"] == "archived"
+
+
+@pytest.mark.unit
+async def test_archived_video_with_same_name_is_uploaded(
+    journal: WorkJournal, video: dict, uploads: list
+) -> None:
+    """Should upload a new video that reuses the name of an archived one."""
+    journal.record(
+        CAPTURE, "event-1/video.mp4", "archived", {"url": "https://old", "bytes": 100}
+    )
+
+    upload_stats = await SyncService().upload_captured_video(
+        "token", EVENT, "status", video, asyncio.Semaphore(1)
+    )
+
+    assert uploads == ["video.mp4"]
+    assert "resumed" not in upload_stats
+    assert journal.get(CAPTURE, "event-1/video.mp4")["data"]["url"] != "https://old"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("stage", "resumed"), [("created", True), ("archived", False)])
+async def test_detection_resumed_only_when_created(
+    journal: WorkJournal, monkeypatch: pytest.MonkeyPatch, stage: str, resumed: bool
+) -> None:
+    """Should only skip to the archive stage for a detection with a created photo."""
+    journal.record(DETECTION, DETECTION_URL, stage, {"g_base_url": DETECTION_URL})
+    lookups = []
+
+    async def archive_detection(*_args: object) -> None:
+        pass
+
+    async def get_photo_by_g_base_url(_self: object, _token: str, url: str) -> dict:
+        lookups.append(url)
+        return {"id": "photo-1"}
+
+    async def update_photo_from_detection(*_args: object) -> None:
+        pass
+
+    monkeypatch.setattr(SyncService, "archive_detection", archive_detection)
+    monkeypatch.setattr(SyncService, "update_photo_from_detection", update_photo_from_detection)
+    monkeypatch.setattr(
+        sync_service.PhotosAdapter, "get_photo_by_g_base_url", get_photo_by_g_base_url
+    )
+    stage_counts: Counter = Counter()
+
+    await SyncService().process_detections(
+        "token", EVENT, [{"url": DETECTION_URL}], [], stage_counts
+    )
+
+    assert stage_counts["resumed"] == int(resumed)
+    assert lookups == ([] if resumed else [DETECTION_URL])
+
+
+@pytest.fixture
+def error_moves(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record blob moves instead of calling cloud storage."""
+    moves = []
+
+    def move_detect_blob(_self: object, _event_id: str, name: str, folder: str) -> None:
+        moves.append((name, folder))
+
+    monkeypatch.setattr(
+        sync_service.GoogleCloudStorageAdapter, "move_detect_blob", move_detect_blob
+    )
+    return moves
+
+
+@pytest.mark.unit
+async def test_detection_moved_to_error_at_limit(
+    journal: WorkJournal, error_moves: list
+) -> None:
+    """Should move a detection to DETECT_ERROR after DETECT_MAX_FAILURES failures."""
+    stage_counts: Counter = Counter()
+    for _ in range(DETECT_MAX_FAILURES):
+        await SyncService().record_detection_failure(
+            EVENT, {"url": DETECTION_URL}, "analyze", stage_counts, error=ValueError()
+        )
+
+    assert error_moves == [("photo.jpg", "DETECT_ERROR")]
+    assert journal.get(DETECTION, DETECTION_URL)["stage"] == "error"
+    assert stage_counts["moved_to_error"] == 1
+
+
+@pytest.mark.unit
+async def test_transient_errors_not_counted(
+    journal: WorkJournal, error_moves: list
+) -> None:
+    """Should keep retrying a detection while a backend is unavailable."""
+    stage_counts: Counter = Counter()
+    for error in [BackendUnavailableError("race service"), TimeoutError()] * 3:
+        await SyncService().record_detection_failure(
+            EVENT, {"url": DETECTION_URL}, "link", stage_counts, error=error
+        )
+
+    assert error_moves == []
+    assert journal.get(DETECTION, DETECTION_URL) is None
+    assert stage_counts["transient_errors"] == 6
+
+
+@pytest.mark.unit
+async def test_created_detection_not_moved_to_error(
+    journal: WorkJournal, error_moves: list
+) -> None:
+    """Should keep retrying the archive move for a detection with a created photo."""
+    journal.record(DETECTION, DETECTION_URL, "created", {"g_base_url": DETECTION_URL})
+    for _ in range(DETECT_MAX_FAILURES):
+        await SyncService().record_detection_failure(
+            EVENT, {"url": DETECTION_URL}, "archive", Counter(), error=ValueError()
+        )
+
+    assert error_moves == []
+    assert journal.get(DETECTION, DETECTION_URL) == {
+        "stage": "created",
+        "data": {"g_base_url": DETECTION_URL},
+    }